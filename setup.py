@@ -18,6 +18,11 @@ setup(
         'seaborn>=0.11.0',
         'jupyter>=1.0.0',
     ],
+    entry_points={
+        'console_scripts': [
+            'gas-pricer=src.cli:main',
+        ],
+    },
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
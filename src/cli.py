@@ -0,0 +1,155 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import csv
+import itertools
+import json
+import logging
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from src.models.contract_pricer import StorageContractPricer
+from src.models.fitting import FIT_PROFILES
+from src.models.predictor import GasPricePredictor
+from src.models.valuation_cache import ValuationCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DATA_PATH = os.path.join('data', 'raw', 'Nat_Gas.csv')
+
+PREDICT_FIELDS = ['date', 'price']
+VALUE_FIELDS = ['id', 'contract_value', 'gross_profit', 'storage_cost', 'injection_cost',
+                'withdrawal_cost', 'transport_cost', 'total_costs']
+
+# Lines treated as a header and skipped by `predict`
+DATE_HEADERS = {'date', 'dates'}
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"expected a positive integer, got {value}")
+    return number
+
+def _batches(lines: Iterable[str], size: int) -> Iterator[List[str]]:
+    # Non-blank input lines in lists of at most `size`; only one batch is held at a time
+    stripped = (line.strip() for line in lines)
+    non_blank = (line for line in stripped if line)
+    while True:
+        batch = list(itertools.islice(non_blank, size))
+        if not batch:
+            return
+        yield batch
+
+class _RowWriter:
+    # Incremental CSV/JSONL writer, flushed after every batch
+    def __init__(self, stream: TextIO, fmt: str, fields: List[str]):
+        self.stream = stream
+        self.fmt = fmt
+        self._csv = None
+        if fmt == 'csv':
+            self._csv = csv.DictWriter(stream, fieldnames=fields, extrasaction='ignore')
+            self._csv.writeheader()
+
+    def write(self, rows: List[Dict]) -> None:
+        if self._csv is not None:
+            self._csv.writerows(rows)
+        else:
+            self.stream.writelines(json.dumps(row) + '\n' for row in rows)
+        self.stream.flush()
+
+def _predict_rows(predictor: GasPricePredictor, batch: List[str]) -> Tuple[List[Dict], int]:
+    try:
+        prices = predictor.predict_batch(batch)
+        return [{'date': d, 'price': float(p)} for d, p in zip(batch, prices)], 0
+    except Exception:
+        # Fall back to single predictions to isolate the offending lines
+        rows, failures = [], 0
+        for target_date in batch:
+            try:
+                rows.append({'date': target_date, 'price': predictor.predict(target_date)})
+            except Exception as e:
+                logger.warning(f"Skipping date '{target_date}': {str(e)}")
+                failures += 1
+        return rows, failures
+
+def _value_rows(pricer: StorageContractPricer, batch: List[str], fmt: str) -> Tuple[List[Dict], int]:
+    specs, ids, failures = [], [], 0
+    for line in batch:
+        try:
+            spec = json.loads(line)
+            if not isinstance(spec, dict):
+                raise ValueError(f"expected a JSON object, got {type(spec).__name__}")
+            ids.append(spec.pop('id', None))
+            specs.append(spec)
+        except ValueError as e:
+            logger.warning(f"Skipping malformed contract line: {str(e)}")
+            failures += 1
+
+    rows = []
+    for contract_id, result in zip(ids, pricer.calculate_contract_values(specs, return_exceptions=True)):
+        if isinstance(result, Exception):
+            logger.warning(f"Skipping contract {contract_id}: {str(result)}")
+            failures += 1
+        elif fmt == 'csv':
+            rows.append({'id': contract_id, 'contract_value': result['contract_value'], **result['details']})
+        else:
+            rows.append({'id': contract_id, **result})
+    return rows, failures
+
+def run_predict(args) -> int:
+    predictor = GasPricePredictor(args.data, fit_profile=args.fit_profile, fit_budget=args.fit_budget)
+    writer = _RowWriter(args.output, args.format, PREDICT_FIELDS)
+    failures = 0
+    lines = (line for line in args.input if line.strip().lower() not in DATE_HEADERS)
+    for batch in _batches(lines, args.batch_size):
+        rows, failed = _predict_rows(predictor, batch)
+        writer.write(rows)
+        failures += failed
+    return 1 if failures else 0
+
+def run_value(args) -> int:
+    cache = ValuationCache(cache_dir=args.cache_dir) if args.cache_dir else None
+    predictor = GasPricePredictor(args.data, fit_profile=args.fit_profile, fit_budget=args.fit_budget)
+    pricer = StorageContractPricer(predictor, cache=cache)
+    writer = _RowWriter(args.output, args.format, VALUE_FIELDS)
+    failures = 0
+    for batch in _batches(args.input, args.batch_size):
+        rows, failed = _value_rows(pricer, batch, args.format)
+        writer.write(rows)
+        failures += failed
+    return 1 if failures else 0
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Batch natural gas price predictions and storage contract valuations.")
+    parser.add_argument('--data', default=DEFAULT_DATA_PATH, help="Price history used to fit the model")
+    parser.add_argument('--fit-profile', choices=list(FIT_PROFILES), default='balanced')
+    parser.add_argument('--fit-budget', type=float, help="Wall-clock budget for the model fit, in seconds")
+    parser.add_argument('--quiet', action='store_true', help="Only log warnings and errors")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    predict = subparsers.add_parser('predict', help="Predict prices for dates, one YYYY-MM-DD per line")
+    predict.set_defaults(handler=run_predict)
+
+    value = subparsers.add_parser('value', help="Value contracts, one JSON object of contract arguments per line")
+    value.add_argument('--cache-dir', help="Directory for a persistent valuation cache")
+    value.set_defaults(handler=run_value)
+
+    for sub in (predict, value):
+        sub.add_argument('-i', '--input', type=argparse.FileType('r'), default=sys.stdin,
+                         help="Input file (default: stdin)")
+        sub.add_argument('-o', '--output', type=argparse.FileType('w'), default=sys.stdout,
+                         help="Output file (default: stdout)")
+        sub.add_argument('-f', '--format', choices=['csv', 'jsonl'], default='csv')
+        sub.add_argument('-b', '--batch-size', type=_positive_int, default=10_000,
+                         help="Lines read and predicted per vectorized call")
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.quiet:
+        logging.getLogger().setLevel(logging.WARNING)
+    return args.handler(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,9 +6,15 @@ logger = logging.getLogger(__name__)
 
 def load_gas_prices(file_path: str) -> pd.DataFrame:
     try:
-        df = pd.read_csv(file_path)
-        df['Dates'] = pd.to_datetime(df['Dates'])
-        df.set_index('Dates', inplace=True)
+        # Columnar files written by src.data.resampling keep their parsed dates
+        if file_path.endswith('.parquet'):
+            df = pd.read_parquet(file_path)
+        elif file_path.endswith('.feather'):
+            df = pd.read_feather(file_path).set_index('Dates')
+        else:
+            df = pd.read_csv(file_path)
+            df['Dates'] = pd.to_datetime(df['Dates'])
+            df.set_index('Dates', inplace=True)
         df.sort_index(inplace=True)
         logger.info(f"Successfully loaded data from {file_path}")
         return df
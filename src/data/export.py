@@ -0,0 +1,111 @@
+import os
+import logging
+from typing import Dict, Optional, Sequence, Union
+import numpy as np
+import pandas as pd
+from src.models.contract_book import ContractBook
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+# File suffix -> export format
+FORMATS = {'.feather': 'feather', '.arrow': 'feather', '.parquet': 'parquet', '.npy': 'npy'}
+
+VALUATION_FIELDS = ['contract_value', 'gross_profit', 'storage_cost', 'injection_cost',
+                    'withdrawal_cost', 'transport_cost', 'total_costs']
+
+Columns = Dict[str, np.ndarray]
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise ImportError("pyarrow is required for Arrow, Feather and Parquet export")
+
+def to_arrow(columns: Columns) -> "pa.Table":
+    # Numeric and datetime64 arrays without nulls are wrapped, not copied
+    _require_pyarrow()
+    return pa.table({name: pa.array(values) for name, values in columns.items()})
+
+def to_frame(columns: Columns) -> pd.DataFrame:
+    return pd.DataFrame(columns)
+
+def _string_dtype(name: str, values: np.ndarray) -> np.dtype:
+    # Object columns become fixed-width strings sized to their longest value
+    if any(value is None for value in values):
+        raise ValueError(f"Column '{name}' contains None, which cannot be stored in a .npy record array")
+    return np.asarray(values, dtype=str).dtype
+
+def to_structured(columns: Columns) -> np.ndarray:
+    # Single record array, the layout written to .npy files
+    dtype = []
+    for name, values in columns.items():
+        values = np.asarray(values)
+        dtype.append((name, _string_dtype(name, values) if values.dtype == object else values.dtype))
+    records = np.empty(len(next(iter(columns.values()))), dtype=dtype)
+    for name, values in columns.items():
+        records[name] = values
+    return records
+
+def write_columns(columns: Columns, path: str, fmt: Optional[str] = None) -> str:
+    # One bulk write of equal-length columns; format is taken from the suffix if not given
+    fmt = fmt or FORMATS.get(os.path.splitext(path)[1].lower())
+    if fmt not in FORMATS.values():
+        raise ValueError(f"Cannot infer export format for {path}, expected one of {list(FORMATS)}")
+
+    try:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        if fmt == 'npy':
+            np.save(path, to_structured(columns), allow_pickle=False)
+        elif fmt == 'feather':
+            feather.write_feather(to_arrow(columns), path)
+        else:
+            pq.write_table(to_arrow(columns), path)
+        logger.info(f"Exported {len(next(iter(columns.values())))} rows to {path}")
+        return path
+    except Exception as e:
+        logger.error(f"Error exporting data: {str(e)}")
+        raise
+
+def valuation_columns(results: Union[Sequence[Dict], ContractBook], ids: Optional[Sequence] = None) -> Columns:
+    # Per-contract table from calculate_contract_value(s) results, one array per field.
+    # A ContractBook already stores these columns and is returned without copying.
+    if isinstance(results, ContractBook):
+        return results.contracts
+    columns = {}
+    if ids is not None:
+        columns['id'] = np.asarray(ids)
+    for field in VALUATION_FIELDS:
+        source = (r['contract_value'] if field == 'contract_value' else r['details'][field] for r in results)
+        columns[field] = np.fromiter(source, dtype=float, count=len(results))
+    columns['n_trades'] = np.fromiter((len(r['details']['purchase_prices']) for r in results),
+                                      dtype=np.int64, count=len(results))
+    return columns
+
+def trade_columns(results: Union[Sequence[Dict], ContractBook]) -> Columns:
+    # Per-trade table: contract position, trade number and purchase/sale prices
+    if isinstance(results, ContractBook):
+        return results.legs
+    counts = np.fromiter((len(r['details']['purchase_prices']) for r in results),
+                         dtype=np.int64, count=len(results))
+    contract = np.repeat(np.arange(len(results)), counts)
+    starts = np.repeat(np.cumsum(counts) - counts, counts)
+    return {
+        'contract': contract,
+        'trade': np.arange(len(contract)) - starts,
+        'purchase_price': np.fromiter((p for r in results for p in r['details']['purchase_prices']),
+                                      dtype=float, count=len(contract)),
+        'sale_price': np.fromiter((p for r in results for p in r['details']['sale_prices']),
+                                  dtype=float, count=len(contract))
+    }
+
+def export_forward_curve(predictor, path: str, steps: int = 12, alpha: float = 0.05) -> str:
+    return write_columns(predictor.forward_curve(steps=steps, alpha=alpha), path)
+
+def export_valuations(results: Union[Sequence[Dict], ContractBook], path: str,
+                      ids: Optional[Sequence] = None) -> str:
+    return write_columns(valuation_columns(results, ids), path)
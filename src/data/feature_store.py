@@ -0,0 +1,118 @@
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Union
+import numpy as np
+import pandas as pd
+from src.data.data_loader import load_gas_prices
+
+logger = logging.getLogger(__name__)
+
+FILL_METHODS = ('climatology', 'ffill', None)
+
+class FeatureStore:
+    def __init__(self, sources: Union[str, List[str], pd.DataFrame],
+                 columns: Optional[List[str]] = None,
+                 fill: Optional[str] = 'climatology',
+                 max_cache_entries: int = 128):
+        # Exogenous regressors loaded once and served as aligned, cached arrays.
+        # Dates missing from the sources (e.g. future forecast dates) are filled with
+        # the calendar-month mean ('climatology'), the last known value ('ffill'),
+        # or rejected (None). Aligned arrays are kept in an LRU of max_cache_entries.
+        if fill not in FILL_METHODS:
+            raise ValueError(f"Unsupported fill method '{fill}', expected one of {list(FILL_METHODS)}")
+        if max_cache_entries < 1:
+            raise ValueError("max_cache_entries must be at least 1")
+        self.fill = fill
+        self.max_cache_entries = max_cache_entries
+
+        try:
+            frame = sources if isinstance(sources, pd.DataFrame) else self._load_sources(sources)
+            frame = frame.copy()
+            frame.index = pd.DatetimeIndex(frame.index).normalize()
+            frame = frame[~frame.index.duplicated(keep='last')].sort_index()
+            if columns is not None:
+                frame = frame[columns]
+            self._frame = frame.astype(float)
+        except Exception as e:
+            logger.error(f"Error loading regressors: {str(e)}")
+            raise
+
+        # Month-of-year means used to fill dates the sources do not cover
+        self._climatology = self._frame.groupby(self._frame.index.month).mean().reindex(range(1, 13)).to_numpy()
+        self._cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __getstate__(self):
+        # Locks cannot be pickled; the copy gets a fresh one (e.g. in a process pool)
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _load_sources(paths: Union[str, List[str]]) -> pd.DataFrame:
+        if isinstance(paths, str):
+            paths = [paths]
+        frames = [load_gas_prices(path) for path in paths]
+        return pd.concat(frames, axis=1, join='outer')
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._frame.columns)
+
+    def align(self, index: pd.DatetimeIndex) -> np.ndarray:
+        # Returns a read-only, C-contiguous (len(index), n_columns) float array
+        index = pd.DatetimeIndex(index).normalize()
+        key = hashlib.sha1(index.asi8.tobytes()).hexdigest()
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self._hits += 1
+                return cached
+
+        values = self._align(index)
+        values.setflags(write=False)
+        with self._lock:
+            self._misses += 1
+            self._cache[key] = values
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_cache_entries:
+                self._cache.popitem(last=False)
+                self._evictions += 1
+        return values
+
+    def _align(self, index: pd.DatetimeIndex) -> np.ndarray:
+        if self.fill == 'ffill':
+            known = self._frame.reindex(self._frame.index.union(index)).ffill()
+            values = known.reindex(index).to_numpy(dtype=float)
+        else:
+            values = self._frame.reindex(index).to_numpy(dtype=float)
+
+        missing = np.isnan(values)
+        if missing.any() and self.fill == 'climatology':
+            values = np.where(missing, self._climatology[index.month - 1], values)
+            missing = np.isnan(values)
+
+        if missing.any():
+            first = index[missing.any(axis=1)][0]
+            raise ValueError(f"No regressor values available for {first.date()}")
+        return np.ascontiguousarray(values)
+
+    def cache_info(self) -> Dict[str, int]:
+        with self._lock:
+            return {'hits': self._hits, 'misses': self._misses, 'evictions': self._evictions,
+                    'size': len(self._cache)}
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self._hits = self._misses = self._evictions = 0
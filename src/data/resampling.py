@@ -0,0 +1,138 @@
+import os
+import logging
+from typing import Optional
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROCESSED_DIR = os.path.join('data', 'processed')
+
+# Output frequency -> period alias used to bucket raw timestamps
+PERIODS = {'ME': 'M', 'D': 'D'}
+
+AGGREGATIONS = ('last', 'first', 'mean', 'min', 'max')
+
+def _aggregate_chunk(chunk: pd.DataFrame, date_column: str, price_column: str,
+                     date_format: Optional[str], period: str) -> pd.DataFrame:
+    # Reduce one chunk of raw prints to per-bucket partial aggregates
+    dates = pd.to_datetime(chunk[date_column], format=date_format, errors='coerce')
+    prices = pd.to_numeric(chunk[price_column], errors='coerce')
+    valid = dates.notna() & prices.notna()
+
+    frame = pd.DataFrame({'ts': dates[valid], 'price': prices[valid]})
+    frame['bucket'] = frame['ts'].dt.to_period(period)
+    frame.sort_values('ts', inplace=True, kind='stable')
+
+    grouped = frame.groupby('bucket', sort=False)
+    return pd.DataFrame({
+        'count': grouped['price'].count(),
+        'sum': grouped['price'].sum(),
+        'min': grouped['price'].min(),
+        'max': grouped['price'].max(),
+        'first_ts': grouped['ts'].first(),
+        'first': grouped['price'].first(),
+        'last_ts': grouped['ts'].last(),
+        'last': grouped['price'].last()
+    })
+
+def _combine_partials(partials: pd.DataFrame) -> pd.DataFrame:
+    # Merge partial aggregates of the same bucket coming from different chunks
+    grouped = partials.groupby(level=0)
+    combined = pd.DataFrame({
+        'count': grouped['count'].sum(),
+        'sum': grouped['sum'].sum(),
+        'min': grouped['min'].min(),
+        'max': grouped['max'].max()
+    })
+    firsts = partials.sort_values('first_ts', kind='stable').groupby(level=0)[['first_ts', 'first']].first()
+    lasts = partials.sort_values('last_ts', kind='stable').groupby(level=0)[['last_ts', 'last']].last()
+    return combined.join(firsts).join(lasts)
+
+def _flag_outliers(prices: pd.Series, window: int, threshold: float) -> pd.Series:
+    # Robust z-score against a centred rolling median / MAD
+    median = prices.rolling(window, center=True, min_periods=1).median()
+    deviation = (prices - median).abs()
+    mad = deviation.rolling(window, center=True, min_periods=1).median()
+    score = 0.6745 * deviation / mad.where(mad > 0)
+    return (score > threshold).fillna(False)
+
+def resample_prices(file_path: str,
+                    freq: str = 'ME',
+                    how: str = 'last',
+                    chunksize: int = 1_000_000,
+                    date_column: str = 'Dates',
+                    price_column: str = 'Prices',
+                    date_format: Optional[str] = None,
+                    fill_method: Optional[str] = 'time',
+                    outlier_window: int = 12,
+                    outlier_threshold: float = 3.5) -> pd.DataFrame:
+    if freq not in PERIODS:
+        raise ValueError(f"Unsupported frequency '{freq}', expected one of {list(PERIODS)}")
+    if how not in AGGREGATIONS:
+        raise ValueError(f"Unsupported aggregation '{how}', expected one of {list(AGGREGATIONS)}")
+    if fill_method not in ('time', 'ffill', None):
+        raise ValueError(f"Unsupported fill method '{fill_method}'")
+
+    try:
+        # Only per-bucket aggregates are kept between chunks, so memory is bounded by the output size
+        running = None
+        rows = 0
+        reader = pd.read_csv(file_path, usecols=[date_column, price_column], chunksize=chunksize)
+        for chunk in reader:
+            rows += len(chunk)
+            partial = _aggregate_chunk(chunk, date_column, price_column, date_format, PERIODS[freq])
+            running = partial if running is None else _combine_partials(pd.concat([running, partial]))
+
+        if running is None or running.empty:
+            raise ValueError(f"No valid price rows found in {file_path}")
+
+        running.sort_index(inplace=True)
+        observed = running['sum'] / running['count'] if how == 'mean' else running[how]
+
+        # Regular index from the first to the last observed bucket
+        periods = pd.period_range(running.index.min(), running.index.max(), freq=PERIODS[freq])
+        observed = observed.reindex(periods)
+        counts = running['count'].reindex(periods, fill_value=0)
+
+        index = periods.to_timestamp(how='end').normalize()
+        index.name = 'Dates'
+        result = pd.DataFrame({
+            'Prices': observed.to_numpy(dtype=float),
+            'Count': counts.to_numpy(dtype=np.int64),
+            'Min': running['min'].reindex(periods).to_numpy(dtype=float),
+            'Max': running['max'].reindex(periods).to_numpy(dtype=float)
+        }, index=index)
+
+        result['Filled'] = result['Prices'].isna()
+        if fill_method == 'time':
+            result['Prices'] = result['Prices'].interpolate(method='time')
+        elif fill_method == 'ffill':
+            result['Prices'] = result['Prices'].ffill()
+
+        result['Outlier'] = _flag_outliers(result['Prices'], outlier_window, outlier_threshold) & ~result['Filled']
+
+        logger.info(f"Resampled {rows} raw rows from {file_path} into {len(result)} '{freq}' buckets "
+                    f"({int(result['Filled'].sum())} filled, {int(result['Outlier'].sum())} outliers)")
+        return result
+    except Exception as e:
+        logger.error(f"Error resampling data: {str(e)}")
+        raise
+
+def processed_path(file_path: str, processed_dir: str = DEFAULT_PROCESSED_DIR) -> str:
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    return os.path.join(processed_dir, f"{stem}.parquet")
+
+def preprocess_price_file(file_path: str, output_path: Optional[str] = None, **kwargs) -> str:
+    # Resample a raw file and write it in columnar form; returns the output path
+    output_path = output_path or processed_path(file_path)
+    result = resample_prices(file_path, **kwargs)
+
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+    if output_path.endswith('.feather'):
+        result.reset_index().to_feather(output_path)
+    else:
+        result.to_parquet(output_path)
+
+    logger.info(f"Wrote processed data to {output_path}")
+    return output_path
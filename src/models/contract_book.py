@@ -0,0 +1,80 @@
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+# Per-contract money fields, in the order they appear in calculate_contract_value results
+VALUE_FIELDS = ['contract_value', 'gross_profit', 'storage_cost', 'injection_cost',
+                'withdrawal_cost', 'transport_cost', 'total_costs']
+
+# Fields shown as cost bars by the plotting helpers
+COST_FIELDS = ['storage_cost', 'injection_cost', 'withdrawal_cost', 'transport_cost', 'total_costs']
+
+class ContractBook:
+    # Valuations for a whole book held as contiguous columns instead of per-contract dicts.
+    # `contracts` has one row per contract (ids, hub, tenor, money fields, n_trades,
+    # first_leg, peak_inventory, error); `legs` has one row per trade (contract,
+    # injection/withdrawal dates, purchase/sale prices, volume). Contracts that could
+    # not be valued carry NaN values and a non-empty error.
+    __slots__ = ('contracts', 'legs')
+
+    def __init__(self, contracts: Dict[str, np.ndarray], legs: Dict[str, np.ndarray]):
+        for table in (contracts, legs):
+            lengths = {len(values) for values in table.values()}
+            if len(lengths) > 1:
+                raise ValueError("All columns of a contract book table must have the same length")
+        self.contracts = contracts
+        self.legs = legs
+
+    def __len__(self) -> int:
+        return len(self.contracts['contract_value'])
+
+    @property
+    def valid(self) -> np.ndarray:
+        return self.contracts['error'] == ''
+
+    def totals(self, fields: Optional[List[str]] = None) -> Dict[str, float]:
+        # Book-wide sums over successfully valued contracts
+        valid = self.valid
+        return {field: float(self.contracts[field][valid].sum()) for field in (fields or VALUE_FIELDS)}
+
+    def groupby(self, by: str = 'hub', fields: Optional[List[str]] = None) -> pd.DataFrame:
+        # Vectorized per-group sums, e.g. by 'hub' or 'tenor'
+        valid = self.valid
+        labels, groups = np.unique(self.contracts[by][valid], return_inverse=True)
+        result = {field: np.bincount(groups, weights=self.contracts[field][valid], minlength=len(labels))
+                  for field in (fields or VALUE_FIELDS)}
+        result['contracts'] = np.bincount(groups, minlength=len(labels))
+        return pd.DataFrame(result, index=pd.Index(labels, name=by))
+
+    def to_frame(self, level: str = 'contract') -> pd.DataFrame:
+        if level == 'contract':
+            return pd.DataFrame(self.contracts)
+        if level == 'leg':
+            return pd.DataFrame(self.legs)
+        raise ValueError(f"Unknown level '{level}', expected 'contract' or 'leg'")
+
+    def cost_breakdown(self) -> Tuple[Dict[str, float], float, float]:
+        # (costs, gross profit, net value) summed over the book
+        totals = self.totals()
+        return {field: totals[field] for field in COST_FIELDS}, totals['gross_profit'], totals['contract_value']
+
+    def leg_prices(self, by: str = 'tenor') -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # (labels, purchase prices, sale prices): volume-weighted per group of valid contracts
+        contract = self.legs['contract']
+        keep = self.valid[contract]
+        labels, groups = np.unique(self.contracts[by][contract[keep]], return_inverse=True)
+        volume = self.legs['volume'][keep]
+        weight = np.bincount(groups, weights=volume, minlength=len(labels))
+        purchases = np.bincount(groups, weights=self.legs['purchase_price'][keep] * volume,
+                                minlength=len(labels)) / weight
+        sales = np.bincount(groups, weights=self.legs['sale_price'][keep] * volume, minlength=len(labels)) / weight
+        return labels, purchases, sales
+
+    def contract(self, i: int) -> Dict:
+        # One contract in the calculate_contract_value result layout
+        start = int(self.contracts['first_leg'][i])
+        stop = start + int(self.contracts['n_trades'][i])
+        details = {field: float(self.contracts[field][i]) for field in VALUE_FIELDS[1:]}
+        details['purchase_prices'] = self.legs['purchase_price'][start:stop].tolist()
+        details['sale_prices'] = self.legs['sale_price'][start:stop].tolist()
+        return {'contract_value': float(self.contracts['contract_value'][i]), 'details': details}
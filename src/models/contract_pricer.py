@@ -2,15 +2,78 @@ import os
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from typing import List, Dict, Union
-from datetime import datetime
+import inspect
+from typing import Iterable, List, Dict, Union, Optional
+from datetime import datetime, date
+import numpy as np
 import pandas as pd
 from src.models.predictor import GasPricePredictor
+from src.models.contract_book import ContractBook
+from src.models.feasibility import NS_PER_DAY, VIOLATION_MESSAGES, check_inventory, sweep_inventory
+from src.models.valuation_cache import ValuationCache
+
+def _normalize_date(value) -> str:
+    # Fast path for ISO strings, pandas for everything else
+    try:
+        return date.fromisoformat(value).isoformat()
+    except (TypeError, ValueError):
+        return pd.Timestamp(value).date().isoformat()
+
+def _reorder_result(result: Dict, order: List[int]) -> Dict:
+    # Copy of result with per-trade prices listed in the given order
+    details = dict(result['details'])
+    details['purchase_prices'] = [details['purchase_prices'][i] for i in order]
+    details['sale_prices'] = [details['sale_prices'][i] for i in order]
+    return {**result, 'details': details, 'feasibility': dict(result.get('feasibility', {}))}
+
+def _restore_result(canonical: Dict, order: List[int]) -> Dict:
+    # Inverse of _reorder_result: map canonical trade order back to the caller's order
+    inverse = [0] * len(order)
+    for position, index in enumerate(order):
+        inverse[index] = position
+    return _reorder_result(canonical, inverse)
+
+def _date_list(values, name: str) -> List:
+    # Date fields must be flat sequences of dates; anything else fails only its own contract
+    if not isinstance(values, (list, tuple, np.ndarray, pd.Index, pd.Series)):
+        raise TypeError(f"{name} must be a list of dates, got {type(values).__name__}")
+    values = list(values)
+    for value in values:
+        if not isinstance(value, (str, date, np.datetime64)):
+            raise TypeError(f"{name} must contain dates, got {type(value).__name__}")
+    return values
+
+class _PriceTable:
+    # Prices for a fixed set of dates, resolved up front with one batch prediction
+    def __init__(self, predictor: GasPricePredictor, dates: Iterable[str]):
+        self.model_version = getattr(predictor, 'model_version', None)
+        dates = list(dates)
+        self._prices = {}
+        try:
+            self._prices = dict(zip(dates, predictor.predict_batch(dates)))
+        except Exception:
+            # Resolve one by one so a bad date only fails the contracts that use it
+            for target_date in dates:
+                try:
+                    self._prices[target_date] = predictor.predict(target_date)
+                except Exception as e:
+                    self._prices[target_date] = e
+
+    def predict(self, target_date: str) -> float:
+        price = self._prices[target_date]
+        if isinstance(price, Exception):
+            raise price
+        return float(price)
+
+    def price_or_nan(self, target_date: str) -> float:
+        price = self._prices[target_date]
+        return np.nan if isinstance(price, Exception) else float(price)
 
 class StorageContractPricer:
-    def __init__(self, price_predictor: GasPricePredictor):
-        #Initialize contract pricer with a price prediction model.
+    def __init__(self, price_predictor: GasPricePredictor, cache: Optional[ValuationCache] = None):
+        #Initialize contract pricer with a price prediction model and an optional valuation cache.
         self.predictor = price_predictor
+        self.cache = cache
 
     def calculate_contract_value(self, 
                                 injection_dates: List[str],
@@ -24,61 +87,277 @@ class StorageContractPricer:
                                 withdrawal_cost: float = 10000,        # $ per million MMBtu
                                 transport_cost: float = 50000          # $ per transport
                                 ) -> Dict[str, Union[float, Dict]]:
+        # Pin one model snapshot so the cache key and the prices agree
+        predictor = getattr(self.predictor, 'snapshot', self.predictor)
+        costs = (volume_per_trade, injection_rate, withdrawal_rate, max_storage,
+                 storage_cost_monthly, injection_cost, withdrawal_cost, transport_cost)
+        return self._calculate(predictor, injection_dates, withdrawal_dates, costs)
+
+    def calculate_contract_values(self, contracts: Iterable[Dict],
+                                  return_exceptions: bool = False) -> List[Union[Dict, Exception]]:
+        # Value many contracts (dicts of calculate_contract_value arguments) with a
+        # single batch prediction over every date they reference.
+        predictor = getattr(self.predictor, 'snapshot', self.predictor)
+        signature = inspect.signature(self.calculate_contract_value)
+
+        # Bind and check every contract first; a malformed one keeps its error for later
+        bound_contracts, dates = [], set()
+        for contract in contracts:
+            try:
+                bound = signature.bind(**contract)
+                bound.apply_defaults()
+                args = bound.arguments
+                for key in ('injection_dates', 'withdrawal_dates'):
+                    args[key] = _date_list(args[key], key)
+                    dates.update(args[key])
+                bound_contracts.append(args)
+            except Exception as e:
+                bound_contracts.append(e)
+        prices = _PriceTable(predictor, dates)
+
+        results = []
+        for args in bound_contracts:
+            try:
+                if isinstance(args, Exception):
+                    raise args
+                costs = tuple(args[name] for name in list(signature.parameters)[2:])
+                results.append(self._calculate(prices, args['injection_dates'], args['withdrawal_dates'], costs))
+            except Exception as e:
+                if not return_exceptions:
+                    raise ValueError(f"Error calculating contract value: {str(e)}")
+                results.append(e)
+        return results
+
+    def price_book(self, contracts: Iterable[Dict]) -> ContractBook:
+        # Columnar counterpart of calculate_contract_values for whole books. Besides the
+        # calculate_contract_value arguments, each dict may carry 'id', 'hub' and 'tenor'
+        # (defaults: position, '' and the first injection month). Contracts that fail
+        # are kept with NaN values and an error message instead of aborting the book.
+        predictor = getattr(self.predictor, 'snapshot', self.predictor)
+        signature = inspect.signature(self.calculate_contract_value)
+        cost_names = list(signature.parameters)[2:]
+
+        ids, hubs, tenors, errors, params = [], [], [], [], []
+        injection_legs, withdrawal_legs = [], []
+        for position, contract in enumerate(contracts):
+            spec = dict(contract) if isinstance(contract, dict) else {}
+            ids.append(spec.pop('id', position))
+            hubs.append(str(spec.pop('hub', '')))
+            tenors.append(spec.pop('tenor', None))
+            try:
+                if not isinstance(contract, dict):
+                    raise TypeError(f"Contract must be a dict, got {type(contract).__name__}")
+                bound = signature.bind(**spec)
+                bound.apply_defaults()
+                args = bound.arguments
+                injection_dates = _date_list(args['injection_dates'], 'injection_dates')
+                withdrawal_dates = _date_list(args['withdrawal_dates'], 'withdrawal_dates')
+                if len(injection_dates) != len(withdrawal_dates):
+                    raise ValueError("Number of injection and withdrawal dates must match")
+                injection_legs.append(injection_dates)
+                withdrawal_legs.append(withdrawal_dates)
+                params.append([float(args[name]) for name in cost_names])
+                errors.append('')
+            except Exception as e:
+                injection_legs.append([])
+                withdrawal_legs.append([])
+                params.append([np.nan] * len(cost_names))
+                errors.append(str(e))
+
+        n = len(ids)
+        costs = dict(zip(cost_names, np.array(params, dtype=float).reshape(n, len(cost_names)).T))
+        n_trades = np.fromiter((len(legs) for legs in injection_legs), dtype=np.int64, count=n)
+        first_leg = np.cumsum(n_trades) - n_trades
+        leg_contract = np.repeat(np.arange(n), n_trades)
+        injection_flat = [d for legs in injection_legs for d in legs]
+        withdrawal_flat = [d for legs in withdrawal_legs for d in legs]
+        n_legs = len(injection_flat)
+
+        # One batch prediction over every distinct date in the book
+        unique_dates, inverse = np.unique(np.asarray(injection_flat + withdrawal_flat, dtype=str),
+                                          return_inverse=True)
+        table = _PriceTable(predictor, unique_dates.tolist())
+        unique_prices = np.array([table.price_or_nan(d) for d in unique_dates.tolist()], dtype=float)
+        prices = unique_prices[inverse.reshape(-1)]
+        purchase_prices, sale_prices = prices[:n_legs], prices[n_legs:]
+
+        injection_dt = pd.DatetimeIndex(pd.to_datetime(injection_flat, errors='coerce'))
+        withdrawal_dt = pd.DatetimeIndex(pd.to_datetime(withdrawal_flat, errors='coerce'))
+        months = ((withdrawal_dt.year - injection_dt.year) * 12
+                  + withdrawal_dt.month - injection_dt.month).to_numpy(dtype=float)
+
+        # Contracts with an unparseable date or an unavailable price
+        bad_legs = np.isnan(months) | np.isnan(purchase_prices) | np.isnan(sale_prices)
+        bad_contracts = np.bincount(leg_contract[bad_legs], minlength=n) > 0
+
+        # Dates are parsed once for the whole book; each contract sweeps its own slice
+        injection_days = injection_dt.asi8 / NS_PER_DAY
+        withdrawal_days = withdrawal_dt.asi8 / NS_PER_DAY
+        peak_inventory = np.full(n, np.nan)
+        for i in range(n):
+            if errors[i]:
+                continue
+            if bad_contracts[i]:
+                errors[i] = "Invalid date or no price available"
+                continue
+            try:
+                legs = slice(first_leg[i], first_leg[i] + n_trades[i])
+                report = sweep_inventory(injection_days[legs], withdrawal_days[legs], costs['volume_per_trade'][i],
+                                         costs['injection_rate'][i], costs['withdrawal_rate'][i],
+                                         costs['max_storage'][i])
+                if not report['feasible']:
+                    errors[i] = f"{VIOLATION_MESSAGES[report['violation']]} on {report['first_violation_date']}"
+                peak_inventory[i] = report['peak_inventory']
+            except Exception as e:
+                errors[i] = str(e)
+
+        # Same arithmetic as _value_contract, summed per contract with bincount
+        volume = costs['volume_per_trade']
+        # bincount returns int64 when there are no legs, so cast for the NaN masking below
+        gross_profit = np.bincount(leg_contract, weights=(sale_prices - purchase_prices) * volume[leg_contract],
+                                   minlength=n).astype(float)
+        storage_months = np.bincount(leg_contract, weights=np.maximum(months, 1), minlength=n).astype(float)
+        total_volume = n_trades * volume
+        storage_cost = costs['storage_cost_monthly'] * storage_months
+        injection_cost = costs['injection_cost'] * (total_volume / 1_000_000)
+        withdrawal_cost = costs['withdrawal_cost'] * (total_volume / 1_000_000)
+        transport_cost = costs['transport_cost'] * 2 * n_trades
+        total_costs = storage_cost + injection_cost + withdrawal_cost + transport_cost
+
+        errors = np.asarray(errors, dtype=str)
+        invalid = errors != ''
+        values = {
+            'contract_value': gross_profit - total_costs,
+            'gross_profit': gross_profit,
+            'storage_cost': storage_cost,
+            'injection_cost': injection_cost,
+            'withdrawal_cost': withdrawal_cost,
+            'transport_cost': transport_cost,
+            'total_costs': total_costs
+        }
+        for column in values.values():
+            column[invalid] = np.nan
+
+        has_legs = n_trades > 0
+        default_tenors = np.full(n, '', dtype=object)
+        default_tenors[has_legs] = injection_dt[first_leg[has_legs]].strftime('%Y-%m')
+        tenor = np.asarray([t if t is not None else default for t, default in zip(tenors, default_tenors)],
+                           dtype=str)
+
+        return ContractBook(
+            contracts={
+                'id': np.asarray(ids),
+                'hub': np.asarray(hubs, dtype=str),
+                'tenor': tenor,
+                **values,
+                'peak_inventory': peak_inventory,
+                'n_trades': n_trades,
+                'first_leg': first_leg,
+                'error': errors
+            },
+            legs={
+                'contract': leg_contract,
+                'injection_date': injection_dt.to_numpy(),
+                'withdrawal_date': withdrawal_dt.to_numpy(),
+                'purchase_price': purchase_prices,
+                'sale_price': sale_prices,
+                'volume': volume[leg_contract]
+            }
+        )
+
+    def _calculate(self, predictor, injection_dates: List[str], withdrawal_dates: List[str],
+                   costs: tuple) -> Dict[str, Union[float, Dict]]:
         try:
             # Validate inputs
             if len(injection_dates) != len(withdrawal_dates):
                 raise ValueError("Number of injection and withdrawal dates must match")
-            
-            total_volume = len(injection_dates) * volume_per_trade
-            if total_volume > max_storage:
-                raise ValueError("Total volume exceeds maximum storage capacity")
-
-            # Calculate purchase and sale prices
-            purchase_prices = []
-            sale_prices = []
-            for inj_date, with_date in zip(injection_dates, withdrawal_dates):
-                purchase_prices.append(self.predictor.predict(inj_date))
-                sale_prices.append(self.predictor.predict(with_date))
-
-            # Calculate storage duration and costs
-            total_storage_months = 0
-            for inj_date, with_date in zip(injection_dates, withdrawal_dates):
-                inj_dt = pd.to_datetime(inj_date)
-                with_dt = pd.to_datetime(with_date)
-                months = (with_dt.year - inj_dt.year) * 12 + with_dt.month - inj_dt.month
-                total_storage_months += max(months, 1)  # Minimum 1 month
-
-            # Calculate each component
-            gross_profit = sum((sale - purchase) * volume_per_trade for sale, purchase in zip(sale_prices, purchase_prices))
-            
-            total_storage_cost = storage_cost_monthly * total_storage_months
-            
-            total_injection_cost = injection_cost * (total_volume / 1_000_000)
-            total_withdrawal_cost = withdrawal_cost * (total_volume / 1_000_000)
-            
-            total_transport_cost = transport_cost * 2 * len(injection_dates)  # Both ways for each trade
-            
-            total_costs = (total_storage_cost + total_injection_cost + total_withdrawal_cost + total_transport_cost)
-
-            net_value = gross_profit - total_costs
-
-            return {
-                'contract_value': net_value,
-                'details': {
-                    'gross_profit': gross_profit,
-                    'storage_cost': total_storage_cost,
-                    'injection_cost': total_injection_cost,
-                    'withdrawal_cost': total_withdrawal_cost,
-                    'transport_cost': total_transport_cost,
-                    'total_costs': total_costs,
-                    'purchase_prices': purchase_prices,
-                    'sale_prices': sale_prices
-                }
-            }
+
+            if self.cache is None:
+                return self._value_contract(predictor, injection_dates, withdrawal_dates, *costs)
+
+            # Trades are keyed in sorted order so reordered contracts share an entry
+            legs = [(_normalize_date(inj_date), _normalize_date(with_date))
+                    for inj_date, with_date in zip(injection_dates, withdrawal_dates)]
+            order = sorted(range(len(legs)), key=legs.__getitem__)
+            # Costs are keyed as floats so 1_000_000 and 1e6 share an entry
+            key = self.cache.make_key([legs[i] for i in order], tuple(float(c) for c in costs),
+                                      getattr(predictor, 'model_version', None))
+
+            cached = self.cache.get(key)
+            if cached is not None:
+                return _restore_result(cached, order)
+
+            result = self._value_contract(predictor, injection_dates, withdrawal_dates, *costs)
+            self.cache.put(key, _reorder_result(result, order))
+            return result
 
         except Exception as e:
             raise ValueError(f"Error calculating contract value: {str(e)}")
 
+    def _value_contract(self,
+                        predictor: GasPricePredictor,
+                        injection_dates: List[str],
+                        withdrawal_dates: List[str],
+                        volume_per_trade: float,
+                        injection_rate: float,
+                        withdrawal_rate: float,
+                        max_storage: float,
+                        storage_cost_monthly: float,
+                        injection_cost: float,
+                        withdrawal_cost: float,
+                        transport_cost: float) -> Dict[str, Union[float, Dict]]:
+        total_volume = len(injection_dates) * volume_per_trade
+
+        # Check the inventory timeline against capacity and daily rate limits
+        feasibility = check_inventory(injection_dates, withdrawal_dates, volume_per_trade,
+                                      injection_rate, withdrawal_rate, max_storage)
+        if not feasibility['feasible']:
+            raise ValueError(f"{VIOLATION_MESSAGES[feasibility['violation']]} on {feasibility['first_violation_date']}")
+
+        # Calculate purchase and sale prices
+        purchase_prices = []
+        sale_prices = []
+        for inj_date, with_date in zip(injection_dates, withdrawal_dates):
+            purchase_prices.append(predictor.predict(inj_date))
+            sale_prices.append(predictor.predict(with_date))
+
+        # Calculate storage duration and costs
+        total_storage_months = 0
+        for inj_date, with_date in zip(injection_dates, withdrawal_dates):
+            inj_dt = pd.to_datetime(inj_date)
+            with_dt = pd.to_datetime(with_date)
+            months = (with_dt.year - inj_dt.year) * 12 + with_dt.month - inj_dt.month
+            total_storage_months += max(months, 1)  # Minimum 1 month
+
+        # Calculate each component
+        gross_profit = sum((sale - purchase) * volume_per_trade for sale, purchase in zip(sale_prices, purchase_prices))
+        
+        total_storage_cost = storage_cost_monthly * total_storage_months
+        
+        total_injection_cost = injection_cost * (total_volume / 1_000_000)
+        total_withdrawal_cost = withdrawal_cost * (total_volume / 1_000_000)
+        
+        total_transport_cost = transport_cost * 2 * len(injection_dates)  # Both ways for each trade
+        
+        total_costs = (total_storage_cost + total_injection_cost + total_withdrawal_cost + total_transport_cost)
+
+        net_value = gross_profit - total_costs
+
+        return {
+            'contract_value': net_value,
+            'details': {
+                'gross_profit': gross_profit,
+                'storage_cost': total_storage_cost,
+                'injection_cost': total_injection_cost,
+                'withdrawal_cost': total_withdrawal_cost,
+                'transport_cost': total_transport_cost,
+                'total_costs': total_costs,
+                'purchase_prices': purchase_prices,
+                'sale_prices': sale_prices
+            },
+            'feasibility': feasibility
+        }
+
 def get_dates_input(prompt):
     #Get and validate dates input.
     while True:
@@ -0,0 +1,96 @@
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+
+NS_PER_DAY = 86_400 * 10**9
+
+# Messages raised by the pricer for each kind of violation
+VIOLATION_MESSAGES = {
+    'capacity': "Total volume exceeds maximum storage capacity",
+    'negative_inventory': "Withdrawal exceeds stored volume",
+    'injection_rate': "Injection rate exceeded",
+    'withdrawal_rate': "Withdrawal rate exceeded"
+}
+
+def _to_days(dates: List[str]) -> np.ndarray:
+    return pd.DatetimeIndex(pd.to_datetime(list(dates))).asi8 / NS_PER_DAY
+
+def _to_date(days: float) -> str:
+    return pd.Timestamp(int(round(days * NS_PER_DAY))).date().isoformat()
+
+def _first_crossing(t: np.ndarray, level: np.ndarray, rate: np.ndarray, breached: np.ndarray,
+                    limit: float) -> Optional[float]:
+    # Time at which the piecewise-linear inventory first crosses `limit`
+    segments = np.flatnonzero(breached)
+    if not len(segments):
+        return None
+    k = segments[0]
+    if rate[k] == 0:
+        return t[k]
+    return t[k] + max((limit - level[k]) / rate[k], 0.0)
+
+def check_inventory(injection_dates: List[str],
+                    withdrawal_dates: List[str],
+                    volume_per_trade: float,
+                    injection_rate: float,
+                    withdrawal_rate: float,
+                    max_storage: float) -> Dict:
+    # Every trade injects volume_per_trade at injection_rate starting on its injection
+    # date and withdraws it at withdrawal_rate starting on its withdrawal date. Rate
+    # changes are swept in time order; cumulative sums give the facility flows and the
+    # piecewise-linear inventory, so the check is O(n log n) in the number of trades.
+    return sweep_inventory(_to_days(injection_dates), _to_days(withdrawal_dates), volume_per_trade,
+                           injection_rate, withdrawal_rate, max_storage)
+
+def sweep_inventory(inj_start: np.ndarray,
+                    wd_start: np.ndarray,
+                    volume_per_trade: float,
+                    injection_rate: float,
+                    withdrawal_rate: float,
+                    max_storage: float) -> Dict:
+    # check_inventory on dates already converted to float days since the epoch
+    if volume_per_trade <= 0:
+        raise ValueError("Volume per trade must be positive")
+    if injection_rate <= 0 or withdrawal_rate <= 0:
+        raise ValueError("Injection and withdrawal rates must be positive")
+
+    n_inj, n_wd = len(inj_start), len(wd_start)
+    if n_inj == 0 and n_wd == 0:
+        return {'feasible': True, 'violation': None, 'first_violation_date': None,
+                'peak_inventory': 0.0, 'peak_date': None}
+
+    times = np.concatenate([inj_start, inj_start + volume_per_trade / injection_rate,
+                            wd_start, wd_start + volume_per_trade / withdrawal_rate])
+    inj_delta = np.concatenate([np.full(n_inj, injection_rate), np.full(n_inj, -injection_rate),
+                                np.zeros(2 * n_wd)])
+    wd_delta = np.concatenate([np.zeros(2 * n_inj),
+                               np.full(n_wd, withdrawal_rate), np.full(n_wd, -withdrawal_rate)])
+
+    order = np.argsort(times, kind='stable')
+    t = times[order]
+    inj_flow = np.cumsum(inj_delta[order])[:-1]   # flow on segment [t[k], t[k + 1])
+    wd_flow = np.cumsum(wd_delta[order])[:-1]
+    duration = np.diff(t)
+    net = inj_flow - wd_flow
+    inventory = np.concatenate([[0.0], np.cumsum(net * duration)])   # level at each t[k]
+
+    tolerance = 1e-9 * max(max_storage, volume_per_trade)
+    active = duration > 0   # simultaneous events produce zero-length segments with transient flows
+
+    candidates = {
+        'capacity': _first_crossing(t, inventory, net, inventory[1:] > max_storage + tolerance, max_storage),
+        'negative_inventory': _first_crossing(t, inventory, net, inventory[1:] < -tolerance, 0.0),
+        'injection_rate': next(iter(t[:-1][active & (inj_flow > injection_rate + tolerance)]), None),
+        'withdrawal_rate': next(iter(t[:-1][active & (wd_flow > withdrawal_rate + tolerance)]), None)
+    }
+    found = {kind: when for kind, when in candidates.items() if when is not None}
+    violation = min(found, key=found.get) if found else None
+
+    peak = int(np.argmax(inventory))
+    return {
+        'feasible': violation is None,
+        'violation': violation,
+        'first_violation_date': _to_date(found[violation]) if violation else None,
+        'peak_inventory': float(inventory[peak]),
+        'peak_date': _to_date(t[peak])
+    }
@@ -0,0 +1,107 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Tuple
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 'model' kwargs go to the SARIMAX constructor, 'fit' kwargs to fit(); listing several
+# methods races them and keeps the best converged result. 'balanced' matches the
+# statsmodels defaults the predictor has always used. Simple differencing is not
+# offered because it makes forecasts come back in differenced units.
+FIT_PROFILES = {
+    'fast': {
+        'methods': ['lbfgs'],
+        'model': {'concentrate_scale': True},
+        'fit': {'maxiter': 25, 'cov_type': 'none'}
+    },
+    'balanced': {
+        'methods': ['lbfgs'],
+        'model': {},
+        'fit': {'maxiter': 50}
+    },
+    'accurate': {
+        'methods': ['lbfgs', 'bfgs', 'powell'],
+        'model': {},
+        'fit': {'maxiter': 200}
+    }
+}
+
+class _BudgetExhausted(Exception):
+    pass
+
+class _IterationMonitor:
+    # Optimizer callback; module level because the fitted results keep a reference
+    # to it and must stay picklable (e.g. for process-pool refits)
+    def __init__(self, deadline: Optional[float]):
+        self.deadline = deadline
+        self.params = None
+        self.iterations = 0
+
+    def __call__(self, params, *args):
+        # Optimizer-space (untransformed) parameters of the latest iterate
+        self.params = np.array(params, copy=True)
+        self.iterations += 1
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise _BudgetExhausted()
+
+def _fit_one(build_model: Callable, model_kwargs: Dict, method: str, fit_kwargs: Dict,
+             deadline: Optional[float]) -> Tuple[object, Dict]:
+    model = build_model(**model_kwargs)
+    monitor = _IterationMonitor(deadline)
+
+    start = time.perf_counter()
+    try:
+        results = model.fit(method=method, disp=False, callback=monitor, **fit_kwargs)
+        converged = bool(results.mle_retvals.get('converged', False)) if results.mle_retvals else False
+        exhausted = False
+    except _BudgetExhausted:
+        # Keep the latest iterate reached so far instead of discarding the work
+        if monitor.params is None:
+            results = model.smooth(model.start_params, cov_type='none')
+        else:
+            results = model.smooth(monitor.params, transformed=False, cov_type='none')
+        converged = False
+        exhausted = True
+
+    return results, {
+        'optimizer': method,
+        'converged': converged,
+        'iterations': monitor.iterations,
+        'budget_exhausted': exhausted,
+        'llf': float(results.llf),
+        'fit_time': time.perf_counter() - start
+    }
+
+def fit_with_profile(build_model: Callable, profile: str = 'balanced',
+                     budget: Optional[float] = None) -> Tuple[object, Dict]:
+    # build_model(**model_kwargs) must return a fresh, unfitted state space model;
+    # every racing optimizer gets its own instance since fitting mutates the model.
+    if profile not in FIT_PROFILES:
+        raise ValueError(f"Unknown fit profile '{profile}', expected one of {list(FIT_PROFILES)}")
+    if budget is not None and budget <= 0:
+        raise ValueError("Fit budget must be positive")
+
+    settings = FIT_PROFILES[profile]
+    methods = settings['methods']
+    start = time.perf_counter()
+    deadline = None if budget is None else start + budget
+
+    if len(methods) == 1:
+        outcomes = [_fit_one(build_model, settings['model'], methods[0], settings['fit'], deadline)]
+    else:
+        with ThreadPoolExecutor(max_workers=len(methods), thread_name_prefix='sarimax-fit') as pool:
+            futures = [pool.submit(_fit_one, build_model, settings['model'], method, settings['fit'], deadline)
+                       for method in methods]
+            outcomes = [future.result() for future in futures]
+
+    # Prefer converged fits, then the highest log-likelihood
+    results, diagnostics = max(outcomes, key=lambda o: (o[1]['converged'], np.nan_to_num(o[1]['llf'], nan=-np.inf)))
+    diagnostics = {**diagnostics, 'fit_profile': profile, 'optimizers_tried': len(methods),
+                   'fit_time': time.perf_counter() - start}
+
+    if not diagnostics['converged']:
+        logger.warning(f"SARIMAX fit did not converge ({profile} profile, {diagnostics['optimizer']}, "
+                       f"budget exhausted: {diagnostics['budget_exhausted']})")
+    return results, diagnostics
@@ -1,19 +1,36 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import hashlib
+import threading
 import pandas as pd
 import numpy as np
 from datetime import datetime
 from statsmodels.tsa.statespace.sarimax import SARIMAX
 from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
 import logging
+from typing import Dict, Optional
+from src.data.data_loader import load_gas_prices
+from src.data.feature_store import FeatureStore
+from src.models.fitting import fit_with_profile
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class GasPricePredictor:
-    def __init__(self, data_path: str):
+    def __init__(self, data_path: str, exog: Optional[FeatureStore] = None,
+                 fit_profile: str = 'balanced', fit_budget: Optional[float] = None):
         self.data_path = data_path
+        self.exog = exog
+        self.fit_profile = fit_profile
+        self.fit_budget = fit_budget
         self.model = None
         self.df = None
         self.metrics = {}
+        self.model_version = None
+        # statsmodels results mutate shared state while forecasting, so model calls are serialized
+        self._model_lock = threading.RLock()
         
         try:
             self._load_data()
@@ -24,11 +41,8 @@ class GasPricePredictor:
 
     def _load_data(self):
         try:
-            self.df = pd.read_csv(self.data_path)
-            self.df['Dates'] = pd.to_datetime(self.df['Dates'])
-            self.df.set_index('Dates', inplace=True)
-            self.df.sort_index(inplace=True)
-            logger.info(f"Successfully loaded data from {self.data_path}")
+            self.df = load_gas_prices(self.data_path)
+            self.freq = pd.infer_freq(self.df.index) or 'ME'
         except Exception as e:
             logger.error(f"Error loading data: {str(e)}")
             raise
@@ -39,30 +53,43 @@ class GasPricePredictor:
             train_size = int(len(self.df) * 0.8)
             train_data = self.df[:train_size]
             test_data = self.df[train_size:]
+            self.train_end = train_data.index[-1]
 
             # Original, proven parameters
-            self.model = SARIMAX(
-                train_data['Prices'],
-                order=(1, 1, 1),
-                seasonal_order=(1, 1, 1, 12)
-            )
+            exog_train = self._exog(train_data.index)
+            def build_model(**model_kwargs):
+                return SARIMAX(
+                    train_data['Prices'],
+                    exog=exog_train,
+                    order=(1, 1, 1),
+                    seasonal_order=(1, 1, 1, 12),
+                    **model_kwargs
+                )
             
-            # Simple fit without extra parameters
-            self.model = self.model.fit(disp=False)
+            # Optimizer settings and wall-clock budget come from the fit profile
+            self.model, diagnostics = fit_with_profile(build_model, self.fit_profile, self.fit_budget)
             
             # Get predictions for test data
             predictions = self.model.get_prediction(
                 start=test_data.index[0],
-                end=test_data.index[-1]
+                end=test_data.index[-1],
+                exog=self._exog(test_data.index)
             ).predicted_mean
             
             # Calculate metrics
             self.metrics = {
                 'rmse': np.sqrt(mean_squared_error(test_data['Prices'], predictions)),
                 'mae': mean_absolute_error(test_data['Prices'], predictions),
-                'r2': r2_score(test_data['Prices'], predictions)
+                'r2': r2_score(test_data['Prices'], predictions),
+                **diagnostics
             }
             
+            # Same parameters filtered through the held-out window, so forecasts can
+            # start from the last observation instead of the end of training
+            self.forecast_model = self.model.append(test_data['Prices'], exog=self._exog(test_data.index))
+
+            self.model_version = self._fingerprint()
+
             logger.info("Model successfully trained")
             logger.info(f"Model performance metrics: {self.metrics}")
             
@@ -70,24 +97,129 @@ class GasPricePredictor:
             logger.error(f"Error training model: {str(e)}")
             raise
 
+    def _exog(self, index: pd.DatetimeIndex) -> Optional[np.ndarray]:
+        # Aligned regressors come from the store's cache, so refits do not repeat the joins
+        return None if self.exog is None else self.exog.align(index)
+
+    def _exog_after_train(self, steps: int) -> Optional[np.ndarray]:
+        # Regressors for the out-of-sample periods following the training window
+        return self._exog_after(self.train_end, steps)
+
+    def _exog_after(self, start: pd.Timestamp, steps: int) -> Optional[np.ndarray]:
+        if self.exog is None or steps <= 0:
+            return None
+        return self._exog(pd.date_range(start, periods=steps + 1, freq=self.freq)[1:])
+
+    def _fingerprint(self) -> str:
+        # Stable across processes so on-disk caches stay valid between restarts
+        digest = hashlib.sha1()
+        digest.update(pd.util.hash_pandas_object(self.df, index=True).values.tobytes())
+        # The forecast origin is included so entries cached when future prices were
+        # forecast from the end of training are not reused
+        digest.update(repr((self.model.model.order, self.model.model.seasonal_order,
+                            'origin', str(self.df.index[-1]))).encode())
+        digest.update(np.asarray(self.model.params, dtype=float).tobytes())
+        return digest.hexdigest()[:16]
+
+    def __getstate__(self):
+        # Locks cannot be pickled; the copy gets a fresh one (e.g. in a process pool)
+        state = self.__dict__.copy()
+        del state['_model_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._model_lock = threading.RLock()
+
     def predict(self, target_date: str) -> float:
+        with self._model_lock:
+            return self._predict(target_date)
+
+    def _predict(self, target_date: str) -> float:
         try:
             date = pd.to_datetime(target_date)
             
-            if date > self.df.index[-1]:
-                # Future prediction
-                steps = ((date.year - self.df.index[-1].year) * 12 + 
-                        date.month - self.df.index[-1].month)
-                forecast = self.model.forecast(steps=steps)
+            last = self.df.index[-1]
+            if date > last:
+                # Future prediction, forecast from the last observation
+                steps = ((date.year - last.year) * 12 + 
+                        date.month - last.month)
+                forecast = self.forecast_model.forecast(steps=steps, exog=self._exog_after(last, steps))
                 return float(forecast.iloc[-1])
             else:
-                # Historical prediction
-                return float(self.model.get_prediction(start=date, end=date).predicted_mean[0])
+                # Historical prediction; dates past the training window are out-of-sample
+                steps = len(self.df.index[(self.df.index > self.train_end) & (self.df.index <= date)])
+                prediction = self.model.get_prediction(start=date, end=date,
+                                                       exog=self._exog_after_train(steps))
+                return float(prediction.predicted_mean.iloc[0])
                 
         except Exception as e:
             logger.error(f"Error making prediction: {str(e)}")
             raise
 
+    def predict_batch(self, target_dates) -> np.ndarray:
+        with self._model_lock:
+            return self._predict_batch(target_dates)
+
+    def _predict_batch(self, target_dates) -> np.ndarray:
+        # Vectorized predict(): one forecast call for all future dates and one
+        # get_prediction call spanning all historical dates.
+        try:
+            dates = pd.DatetimeIndex(pd.to_datetime(list(target_dates)))
+            last = self.df.index[-1]
+            prices = np.empty(len(dates), dtype=float)
+
+            future = np.asarray(dates > last)
+            if future.any():
+                steps = (dates.year - last.year) * 12 + dates.month - last.month
+                steps = np.asarray(steps)[future]
+                max_steps = int(steps.max())
+                forecast = self.forecast_model.forecast(steps=max_steps, exog=self._exog_after(last, max_steps))
+                prices[future] = forecast.to_numpy()[steps - 1]
+
+            # Historical dates between index points go through predict() one by one
+            on_index = ~future & (self.df.index.get_indexer(dates) >= 0)
+            for k in np.flatnonzero(~future & ~on_index):
+                prices[k] = self._predict(dates[k])
+
+            if on_index.any():
+                historical = dates[on_index]
+                start, end = historical.min(), historical.max()
+                steps = len(self.df.index[(self.df.index > self.train_end) & (self.df.index <= end)])
+                predicted = self.model.get_prediction(start=start, end=end,
+                                                      exog=self._exog_after_train(steps)).predicted_mean
+                prices[on_index] = predicted.to_numpy()[predicted.index.get_indexer(historical)]
+
+            return prices
+
+        except Exception as e:
+            logger.error(f"Error making batch prediction: {str(e)}")
+            raise
+
+    def forward_curve(self, steps: int = 12, alpha: float = 0.05) -> Dict[str, np.ndarray]:
+        with self._model_lock:
+            return self._forward_curve(steps, alpha)
+
+    def _forward_curve(self, steps: int, alpha: float) -> Dict[str, np.ndarray]:
+        # Monthly forecasts and (1 - alpha) intervals for the `steps` periods after the
+        # last observed date, conditioned on all data including the held-out window
+        try:
+            if steps < 1:
+                raise ValueError("Forward curve needs at least one step")
+            last = self.df.index[-1]
+            forecast = self.forecast_model.get_forecast(steps=steps, exog=self._exog_after(last, steps))
+            intervals = np.asarray(forecast.conf_int(alpha=alpha), dtype=float)
+            dates = pd.date_range(last, periods=steps + 1, freq=self.freq)[1:]
+            return {
+                'date': dates.to_numpy(),
+                'mean': np.ascontiguousarray(forecast.predicted_mean, dtype=float),
+                'lower': np.ascontiguousarray(intervals[:, 0]),
+                'upper': np.ascontiguousarray(intervals[:, 1])
+            }
+        except Exception as e:
+            logger.error(f"Error building forward curve: {str(e)}")
+            raise
+
     def get_metrics(self):
         return self.metrics
 
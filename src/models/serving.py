@@ -0,0 +1,147 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import logging
+import threading
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Dict, Optional
+
+from src.models.predictor import GasPricePredictor
+
+logger = logging.getLogger(__name__)
+
+# Metrics a refitted model is compared on against the live snapshot
+GATED_METRICS = ('rmse', 'mae', 'r2')
+
+# By default a refit may be at most this much worse (relative) than the live model
+DEFAULT_MAX_DEGRADATION = 0.10
+
+# Metrics where larger is better; every other metric must stay at or below its threshold
+HIGHER_IS_BETTER = {'r2'}
+
+def _build_predictor(data_path: str, predictor_kwargs: Dict) -> GasPricePredictor:
+    # Module level so the build can also be shipped to a ProcessPoolExecutor
+    return GasPricePredictor(data_path, **predictor_kwargs)
+
+class HotSwapPredictor:
+    def __init__(self,
+                 data_path: str,
+                 metric_thresholds: Optional[Dict[str, float]] = None,
+                 executor: Optional[Executor] = None,
+                 max_degradation: Optional[float] = DEFAULT_MAX_DEGRADATION,
+                 **predictor_kwargs):
+        # Serve predictions from an immutable snapshot while refits run in the background.
+        # A refit is swapped in only if no gated metric is worse than the live model's by
+        # more than max_degradation (None disables the check) and it meets the optional
+        # absolute metric_thresholds.
+        self.data_path = data_path
+        self.metric_thresholds = dict(metric_thresholds or {})
+        self.max_degradation = max_degradation
+        self._predictor_kwargs = predictor_kwargs
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(max_workers=1,
+                                                        thread_name_prefix='predictor-refit')
+        self._refit_lock = threading.Lock()
+        self._pending: Optional[Future] = None
+
+        # (version, predictor) is swapped as a single reference so readers never see a mix
+        self._current = (1, _build_predictor(data_path, predictor_kwargs))
+
+    @property
+    def snapshot(self) -> GasPricePredictor:
+        return self._current[1]
+
+    @property
+    def version(self) -> int:
+        return self._current[0]
+
+    @property
+    def model_version(self) -> str:
+        return self._current[1].model_version
+
+    def predict(self, target_date: str) -> float:
+        # Grab the reference once; a concurrent swap does not affect this call
+        return self._current[1].predict(target_date)
+
+    def get_metrics(self) -> Dict[str, float]:
+        return dict(self._current[1].get_metrics())
+
+    def refit(self, data_path: Optional[str] = None) -> Future:
+        # Returns a future resolving to True if the new model was swapped in,
+        # False if it was rejected by the metric thresholds.
+        with self._refit_lock:
+            if self._pending is not None and not self._pending.done():
+                return self._pending
+
+            path = data_path or self.data_path
+            outcome = Future()
+            outcome.set_running_or_notify_cancel()
+            self._pending = outcome
+            try:
+                build = self._executor.submit(_build_predictor, path, self._predictor_kwargs)
+            except Exception as e:
+                # e.g. the executor was shut down; resolve so later refits are not stuck on it
+                logger.error(f"Could not start background refit: {str(e)}")
+                outcome.set_exception(e)
+                return outcome
+            build.add_done_callback(lambda f: self._finish_refit(f, path, outcome))
+            return outcome
+
+    def _finish_refit(self, build: Future, data_path: str, outcome: Future) -> None:
+        try:
+            candidate = build.result()
+        except Exception as e:
+            logger.error(f"Background refit failed: {str(e)}")
+            outcome.set_exception(e)
+            return
+
+        failures = self._failed_metrics(candidate.get_metrics(), self._current[1].get_metrics())
+        if failures:
+            logger.warning(f"Refitted model rejected, metrics outside thresholds: {failures}")
+            outcome.set_result(False)
+            return
+
+        version = self._current[0] + 1
+        self._current = (version, candidate)
+        self.data_path = data_path
+        logger.info(f"Swapped in refitted model version {version}")
+        outcome.set_result(True)
+
+    def _failed_metrics(self, metrics: Dict[str, float],
+                        live_metrics: Dict[str, float]) -> Dict[str, Optional[float]]:
+        thresholds = {}
+        if self.max_degradation is not None:
+            for name in GATED_METRICS:
+                live = live_metrics.get(name)
+                if live is None or live != live:
+                    continue
+                margin = self.max_degradation * abs(live)
+                thresholds[name] = live - margin if name in HIGHER_IS_BETTER else live + margin
+        for name, threshold in self.metric_thresholds.items():
+            # Absolute gates apply on top of the relative ones; the stricter wins
+            if name in thresholds:
+                pick = max if name in HIGHER_IS_BETTER else min
+                threshold = pick(threshold, thresholds[name])
+            thresholds[name] = threshold
+
+        failures = {}
+        for name, threshold in thresholds.items():
+            value = metrics.get(name)
+            if value is None or value != value:  # missing or NaN
+                failures[name] = value
+            elif name in HIGHER_IS_BETTER and value < threshold:
+                failures[name] = value
+            elif name not in HIGHER_IS_BETTER and value > threshold:
+                failures[name] = value
+        return failures
+
+    def close(self, wait: bool = True) -> None:
+        if self._owns_executor:
+            self._executor.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,166 @@
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Share of max_disk_entries kept when the disk tier is pruned, so pruning is not run on every write
+DISK_PRUNE_RATIO = 0.9
+
+class ValuationCache:
+    def __init__(self, max_entries: int = 1024, cache_dir: Optional[str] = None,
+                 max_disk_entries: Optional[int] = 100_000):
+        # In-memory LRU tier, optionally backed by a pickle-per-entry directory on disk.
+        # The disk tier drops its least recently used files once it holds more than
+        # max_disk_entries, which also clears out entries of retired model versions.
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        if max_disk_entries is not None and max_disk_entries < 1:
+            raise ValueError("max_disk_entries must be at least 1")
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.cache_dir = cache_dir
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._disk_evictions = 0
+        self._disk_count = 0
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            self._disk_count = len(self._disk_files())
+
+    @staticmethod
+    def make_key(legs: Sequence[Tuple[str, str]], params: Tuple, model_version: Optional[str]) -> str:
+        # Legs must already be normalized and sorted by the caller
+        payload = repr((tuple(legs), tuple(params), model_version)).encode()
+        return hashlib.sha1(payload).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return value
+
+        value = self._read_disk(key)
+        with self._lock:
+            if value is None:
+                self._misses += 1
+                return None
+            self._disk_hits += 1
+            self._store(key, value)
+            return value
+
+    def put(self, key: str, value: Dict) -> None:
+        with self._lock:
+            self._store(key, value)
+        self._write_disk(key, value)
+
+    def _store(self, key: str, value: Dict) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def _disk_files(self) -> List[str]:
+        return [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir)
+                if name.endswith('.pkl')]
+
+    def _read_disk(self, key: str) -> Optional[Dict]:
+        if not self.cache_dir:
+            return None
+        try:
+            path = self._disk_path(key)
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+            os.utime(path)  # mark as recently used for pruning
+            return value
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cache entry {key}: {str(e)}")
+            return None
+
+    def _write_disk(self, key: str, value: Dict) -> None:
+        if not self.cache_dir:
+            return
+        try:
+            # Write then rename so concurrent readers never see a partial file
+            path = self._disk_path(key)
+            is_new = not os.path.exists(path)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Failed to persist cache entry {key}: {str(e)}")
+            return
+
+        with self._lock:
+            self._disk_count += is_new
+            prune = self.max_disk_entries is not None and self._disk_count > self.max_disk_entries
+        if prune:
+            self._prune_disk()
+
+    def _prune_disk(self) -> None:
+        # Remove the least recently used files down to DISK_PRUNE_RATIO of the limit.
+        # The directory is rescanned, so files written by other processes are counted too.
+        keep = int(self.max_disk_entries * DISK_PRUNE_RATIO)
+        entries = []
+        for path in self._disk_files():
+            try:
+                entries.append((os.path.getmtime(path), path))
+            except FileNotFoundError:
+                continue
+        entries.sort()
+        removed = 0
+        for _, path in entries[:max(len(entries) - keep, 0)]:
+            try:
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
+                continue
+        with self._lock:
+            self._disk_count = len(entries) - removed
+            self._disk_evictions += removed
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self._hits + self._disk_hits + self._misses
+            return {
+                'hits': self._hits,
+                'disk_hits': self._disk_hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'disk_evictions': self._disk_evictions,
+                'size': len(self._entries),
+                'disk_size': self._disk_count,
+                'hit_rate': (self._hits + self._disk_hits) / lookups if lookups else 0.0
+            }
+
+    def clear(self, disk: bool = False) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._disk_hits = self._misses = self._evictions = self._disk_evictions = 0
+        if disk and self.cache_dir:
+            for path in self._disk_files():
+                os.remove(path)
+            with self._lock:
+                self._disk_count = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+
+def _x_values(index: pd.Index) -> np.ndarray:
+    # Numeric x coordinates for area/bucket computations
+    if isinstance(index, pd.DatetimeIndex):
+        return index.asi8.astype(float)
+    if pd.api.types.is_numeric_dtype(index):
+        return index.to_numpy(dtype=float)
+    return np.arange(len(index), dtype=float)
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    # Largest-Triangle-Three-Buckets: keeps the point in each bucket that forms the
+    # largest triangle with the previous pick and the next bucket's average.
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+
+    previous = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = (edges[i + 1], edges[i + 2]) if i + 2 < len(edges) else (n - 1, n)
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        area = np.abs((x[previous] - avg_x) * (y[start:end] - y[previous])
+                      - (x[previous] - x[start:end]) * (avg_y - y[previous]))
+        previous = start + int(np.argmax(np.nan_to_num(area, nan=-1.0)))
+        selected[i + 1] = previous
+    return selected
+
+def min_max_indices(y: np.ndarray, n_buckets: int) -> np.ndarray:
+    # Keep the minimum and maximum point of each equal-width bucket, plus the series endpoints
+    n = len(y)
+    if 2 * n_buckets >= n or n_buckets < 1:
+        return np.arange(n)
+
+    bucket = np.arange(n) * n_buckets // n
+    order = np.lexsort((y, bucket))
+    starts = np.searchsorted(bucket[order], np.arange(n_buckets))
+    ends = np.append(starts[1:], n) - 1
+    return np.unique(np.concatenate(([0, n - 1], order[starts], order[ends])))
+
+def downsample(series: pd.Series, n_out: int, method: str = 'lttb') -> pd.Series:
+    # Reduce a series to about n_out points without visibly changing its line plot
+    if len(series) <= n_out:
+        return series
+    y = series.to_numpy(dtype=float)
+    if method == 'lttb':
+        indices = lttb_indices(_x_values(series.index), y, n_out)
+    elif method == 'minmax':
+        indices = min_max_indices(y, max(n_out // 2, 1))
+    else:
+        raise ValueError(f"Unknown downsampling method '{method}'")
+    return series.iloc[indices]
+
+def thin(values: pd.Series, max_points: int) -> pd.Series:
+    # Evenly strided sample, for distribution plots where point order does not matter
+    if len(values) <= max_points:
+        return values
+    step = int(np.ceil(len(values) / max_points))
+    return values.iloc[::step]
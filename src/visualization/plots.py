@@ -1,8 +1,17 @@
+import warnings
 import matplotlib.pyplot as plt
 import seaborn as sns
 import pandas as pd
-from typing import Optional, Tuple, Dict
+from typing import Optional, Tuple, Dict, Union
 import numpy as np
+from src.models.contract_book import ContractBook
+from src.visualization.downsampling import downsample, thin
+
+# Line plots keep two points per horizontal pixel of the axes they are drawn on
+POINTS_PER_PIXEL = 2
+
+# Histogram/KDE panels sample at most this many residuals
+DISTRIBUTION_SAMPLE = 20_000
 
 def set_style():
     sns.set_theme()
@@ -10,18 +19,31 @@ def set_style():
     plt.rcParams['figure.figsize'] = (12, 6)
     plt.rcParams['font.size'] = 12
 
-def plot_price_history(df: pd.DataFrame, title: str = "Natural Gas Price History", save_path: Optional[str] = None) -> None:
+def _target_points(ax, max_points: Optional[int] = None) -> int:
+    # Output resolution, not data size, bounds how many points get drawn
+    if max_points is not None:
+        return max_points
+    return max(int(ax.bbox.width) * POINTS_PER_PIXEL, 3)
+
+def _trend_line(series: pd.Series) -> Tuple[pd.Index, np.ndarray]:
+    # Least-squares fit against positions; a straight line only needs its endpoints
+    positions = np.arange(len(series), dtype=float)
+    p = np.poly1d(np.polyfit(positions, series.to_numpy(dtype=float), 1))
+    return series.index[[0, -1]], p(positions[[0, -1]])
+
+def plot_price_history(df: pd.DataFrame, title: str = "Natural Gas Price History", save_path: Optional[str] = None,
+                       max_points: Optional[int] = None) -> None:
     set_style()
     
     fig, ax = plt.subplots()
     
     # Plot actual prices
-    ax.plot(df.index, df['Prices'], label='Actual Prices', color='blue')
+    prices = downsample(df['Prices'], _target_points(ax, max_points))
+    ax.plot(prices.index, prices, label='Actual Prices', color='blue')
     
     # Add trend line
-    z = np.polyfit(range(len(df)), df['Prices'], 1)
-    p = np.poly1d(z)
-    ax.plot(df.index, p(range(len(df))), 
+    trend_x, trend_y = _trend_line(df['Prices'])
+    ax.plot(trend_x, trend_y, 
             linestyle='--', color='red', label='Trend Line')
     
     ax.set_title(title)
@@ -55,11 +77,15 @@ def plot_seasonal_patterns(df: pd.DataFrame, save_path: Optional[str] = None) ->
         plt.savefig(save_path)
     plt.show()
 
-def plot_prediction_vs_actual(actual: pd.Series, predicted: pd.Series, title: str = "Predicted vs Actual Prices", save_path: Optional[str] = None) -> None:
+def plot_prediction_vs_actual(actual: pd.Series, predicted: pd.Series, title: str = "Predicted vs Actual Prices", save_path: Optional[str] = None,
+                              max_points: Optional[int] = None) -> None:
     set_style()
     
     fig, ax = plt.subplots()
     
+    n_points = _target_points(ax, max_points)
+    actual = downsample(actual, n_points)
+    predicted = downsample(predicted, n_points)
     ax.plot(actual.index, actual, label='Actual', color='blue')
     ax.plot(predicted.index, predicted, label='Predicted', 
             color='red', linestyle='--')
@@ -76,7 +102,8 @@ def plot_prediction_vs_actual(actual: pd.Series, predicted: pd.Series, title: st
         plt.savefig(save_path)
     plt.show()
 
-def plot_residuals(actual: pd.Series, predicted: pd.Series, save_path: Optional[str] = None) -> None:
+def plot_residuals(actual: pd.Series, predicted: pd.Series, save_path: Optional[str] = None,
+                   max_points: Optional[int] = None) -> None:
     set_style()
     
     residuals = actual - predicted
@@ -84,14 +111,15 @@ def plot_residuals(actual: pd.Series, predicted: pd.Series, save_path: Optional[
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 5))
     
     # Residuals over time
-    ax1.plot(actual.index, residuals, 'o-')
+    shown = downsample(residuals, _target_points(ax1, max_points))
+    ax1.plot(shown.index, shown, 'o-')
     ax1.axhline(y=0, color='r', linestyle='--')
     ax1.set_title('Residuals Over Time')
     ax1.set_xlabel('Date')
     ax1.set_ylabel('Residual')
     
     # Residuals distribution
-    sns.histplot(residuals, kde=True, ax=ax2)
+    sns.histplot(thin(residuals, DISTRIBUTION_SAMPLE), kde=True, ax=ax2)
     ax2.set_title('Residuals Distribution')
     ax2.set_xlabel('Residual')
     
@@ -101,7 +129,8 @@ def plot_residuals(actual: pd.Series, predicted: pd.Series, save_path: Optional[
         plt.savefig(save_path)
     plt.show()
 
-def create_analysis_dashboard(df: pd.DataFrame, actual: pd.Series, predicted: pd.Series, save_path: Optional[str] = None) -> None:
+def create_analysis_dashboard(df: pd.DataFrame, actual: pd.Series, predicted: pd.Series, save_path: Optional[str] = None,
+                              max_points: Optional[int] = None) -> None:
     set_style()
     
     fig = plt.figure(figsize=(15, 10))
@@ -109,8 +138,11 @@ def create_analysis_dashboard(df: pd.DataFrame, actual: pd.Series, predicted: pd
     
     # Price history and predictions
     ax1 = fig.add_subplot(gs[0, :])
-    ax1.plot(actual.index, actual, label='Actual', color='blue')
-    ax1.plot(predicted.index, predicted, label='Predicted', color='red', linestyle='--')
+    n_points = _target_points(ax1, max_points)
+    shown_actual = downsample(actual, n_points)
+    shown_predicted = downsample(predicted, n_points)
+    ax1.plot(shown_actual.index, shown_actual, label='Actual', color='blue')
+    ax1.plot(shown_predicted.index, shown_predicted, label='Predicted', color='red', linestyle='--')
     ax1.set_title('Price History and Predictions')
     ax1.set_xlabel('Date')
     ax1.set_ylabel('Price')
@@ -126,7 +158,7 @@ def create_analysis_dashboard(df: pd.DataFrame, actual: pd.Series, predicted: pd
     # Residuals distribution
     ax3 = fig.add_subplot(gs[1, 1])
     residuals = actual - predicted
-    sns.histplot(residuals, kde=True, ax=ax3)
+    sns.histplot(thin(residuals, DISTRIBUTION_SAMPLE), kde=True, ax=ax3)
     ax3.set_title('Residuals Distribution')
     
     plt.tight_layout()
@@ -135,12 +167,44 @@ def create_analysis_dashboard(df: pd.DataFrame, actual: pd.Series, predicted: pd
         plt.savefig(save_path)
     plt.show()
 
-def plot_contract_costs(contract_details: Dict, save_path: Optional[str] = None) -> None:
+def _cost_breakdown(contract_details: Union[Dict, ContractBook]) -> Tuple[Dict[str, float], float, float]:
+    # (costs, gross profit, net value) for a single valuation or a whole book
+    if isinstance(contract_details, ContractBook):
+        return contract_details.cost_breakdown()
+    costs = {k: v for k, v in contract_details['details'].items() 
+            if k not in ['purchase_prices', 'sale_prices', 'gross_profit']}
+    return costs, contract_details['details']['gross_profit'], contract_details['contract_value']
+
+def _warn_unused_dates(injection_dates, withdrawal_dates) -> None:
+    if injection_dates is not None or withdrawal_dates is not None:
+        warnings.warn("injection_dates and withdrawal_dates are unused and will be removed; "
+                      "pass contract_details only", DeprecationWarning, stacklevel=3)
+
+def _plot_trade_bars(ax, contract_details: Union[Dict, ContractBook], by: str) -> str:
+    # One bar pair per trade for a single valuation; a book is aggregated per `by` group
+    # so the number of bars does not grow with the number of legs
+    if isinstance(contract_details, ContractBook):
+        labels, purchases, sales = contract_details.leg_prices(by)
+        group = by.capitalize()
+    else:
+        details = contract_details['details']
+        purchases, sales = details['purchase_prices'], details['sale_prices']
+        labels, group = None, 'Trade'
+
+    trades = np.arange(len(purchases))
+    width = 0.35
+    ax.bar(trades - width/2, purchases, width, label='Purchase Price')
+    ax.bar(trades + width/2, sales, width, label='Sale Price')
+    if labels is not None:
+        ax.set_xticks(trades)
+        ax.set_xticklabels(labels, rotation=45)
+    return group
+
+def plot_contract_costs(contract_details: Union[Dict, ContractBook], save_path: Optional[str] = None) -> None:
     set_style()
     
     # Extract costs
-    costs = {k: v for k, v in contract_details['details'].items() 
-            if k not in ['purchase_prices', 'sale_prices', 'gross_profit']}
+    costs, _, _ = _cost_breakdown(contract_details)
     
     # Create bar plot
     plt.figure(figsize=(10, 6))
@@ -154,21 +218,17 @@ def plot_contract_costs(contract_details: Dict, save_path: Optional[str] = None)
         plt.savefig(save_path)
     plt.show()
 
-def plot_trade_prices(injection_dates: list, withdrawal_dates: list, contract_details: Dict, save_path: Optional[str] = None) -> None:
+def plot_trade_prices(injection_dates: Optional[list] = None, withdrawal_dates: Optional[list] = None,
+                      contract_details: Union[Dict, ContractBook] = None, save_path: Optional[str] = None,
+                      by: str = 'tenor') -> None:
+    _warn_unused_dates(injection_dates, withdrawal_dates)
     set_style()
     
-    purchases = contract_details['details']['purchase_prices']
-    sales = contract_details['details']['sale_prices']
-    
     fig, ax = plt.subplots(figsize=(12, 6))
-    trades = range(len(injection_dates))
-    
-    width = 0.35
-    ax.bar([i - width/2 for i in trades], purchases, width, label='Purchase Price')
-    ax.bar([i + width/2 for i in trades], sales, width, label='Sale Price')
+    group = _plot_trade_bars(ax, contract_details, by)
     
-    plt.title('Purchase vs Sale Prices by Trade')
-    plt.xlabel('Trade Number')
+    plt.title(f'Purchase vs Sale Prices by {group}')
+    plt.xlabel('Trade Number' if group == 'Trade' else group)
     plt.ylabel('Price')
     plt.legend()
     
@@ -177,7 +237,10 @@ def plot_trade_prices(injection_dates: list, withdrawal_dates: list, contract_de
         plt.savefig(save_path)
     plt.show()
 
-def create_contract_dashboard(injection_dates: list, withdrawal_dates: list, contract_details: Dict, save_path: Optional[str] = None) -> None:
+def create_contract_dashboard(injection_dates: Optional[list] = None, withdrawal_dates: Optional[list] = None,
+                              contract_details: Union[Dict, ContractBook] = None, save_path: Optional[str] = None,
+                              by: str = 'tenor') -> None:
+    _warn_unused_dates(injection_dates, withdrawal_dates)
     set_style()
     
     fig = plt.figure(figsize=(15, 10))
@@ -185,19 +248,13 @@ def create_contract_dashboard(injection_dates: list, withdrawal_dates: list, con
     
     # Trade prices
     ax1 = fig.add_subplot(gs[0, 0])
-    purchases = contract_details['details']['purchase_prices']
-    sales = contract_details['details']['sale_prices']
-    width = 0.35
-    trades = range(len(injection_dates))
-    ax1.bar([i - width/2 for i in trades], purchases, width, label='Purchase')
-    ax1.bar([i + width/2 for i in trades], sales, width, label='Sale')
+    _plot_trade_bars(ax1, contract_details, by)
     ax1.set_title('Trade Prices')
     ax1.legend()
     
     # Cost breakdown
     ax2 = fig.add_subplot(gs[0, 1])
-    costs = {k: v for k, v in contract_details['details'].items() 
-            if k not in ['purchase_prices', 'sale_prices', 'gross_profit']}
+    costs, gross_profit, net_value = _cost_breakdown(contract_details)
     ax2.bar(costs.keys(), costs.values())
     ax2.set_title('Cost Breakdown')
     plt.setp(ax2.xaxis.get_majorticklabels(), rotation=45)
@@ -205,9 +262,9 @@ def create_contract_dashboard(injection_dates: list, withdrawal_dates: list, con
     # Profit waterfall
     ax3 = fig.add_subplot(gs[1, :])
     components = ['Gross Profit'] + list(costs.keys()) + ['Net Value']
-    values = [contract_details['details']['gross_profit']] + \
+    values = [gross_profit] + \
             list(-np.array(list(costs.values()))) + \
-            [contract_details['contract_value']]
+            [net_value]
     ax3.bar(components, values)
     ax3.set_title('Profit Waterfall')
     plt.setp(ax3.xaxis.get_majorticklabels(), rotation=45)
@@ -215,4 +272,4 @@ def create_contract_dashboard(injection_dates: list, withdrawal_dates: list, con
     plt.tight_layout()
     if save_path:
         plt.savefig(save_path)
-    plt.show()
\ No newline at end of file
+    plt.show()
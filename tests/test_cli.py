@@ -0,0 +1,66 @@
+import json
+import pandas as pd
+import pytest
+from src.cli import main
+
+def test_predict_csv(tmp_path):
+    #Test batch prediction from a date file to CSV.
+    source = tmp_path / 'dates.txt'
+    source.write_text("Dates\n2022-06-30\n\n2024-12-31\n")
+    output = tmp_path / 'prices.csv'
+
+    assert main(['--quiet', 'predict', '-i', str(source), '-o', str(output), '-b', '1']) == 0
+    df = pd.read_csv(output)
+    assert list(df.columns) == ['date', 'price']
+    assert list(df['date']) == ['2022-06-30', '2024-12-31']
+    assert df['price'].between(9.5, 13.5).all()
+
+def test_predict_skips_bad_dates(tmp_path):
+    #Test that invalid dates are skipped and reported through the exit code.
+    source = tmp_path / 'dates.txt'
+    source.write_text("2022-06-30\nnot-a-date\n")
+    output = tmp_path / 'prices.jsonl'
+
+    assert main(['--quiet', 'predict', '-i', str(source), '-o', str(output), '-f', 'jsonl']) == 1
+    rows = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [row['date'] for row in rows] == ['2022-06-30']
+
+def test_value_jsonl(tmp_path):
+    #Test batch contract valuation from JSONL specs.
+    contract = {'injection_dates': ['2024-06-30'], 'withdrawal_dates': ['2024-12-31'],
+                'volume_per_trade': 1_000_000, 'injection_rate': 50_000,
+                'withdrawal_rate': 50_000, 'max_storage': 2_000_000}
+    source = tmp_path / 'contracts.jsonl'
+    source.write_text('\n'.join(json.dumps({'id': i, **contract}) for i in range(3)) + '\n')
+    output = tmp_path / 'values.csv'
+
+    assert main(['--quiet', 'value', '-i', str(source), '-o', str(output), '-b', '2']) == 0
+    df = pd.read_csv(output)
+    assert list(df['id']) == [0, 1, 2]
+    assert df['contract_value'].nunique() == 1
+    assert (df['storage_cost'] == 600_000).all()
+
+def test_value_skips_malformed_lines(tmp_path):
+    #Test that malformed contracts fail alone and valid neighbours are still written.
+    contract = {'injection_dates': ['2024-06-30'], 'withdrawal_dates': ['2024-12-31'],
+                'volume_per_trade': 1_000_000, 'injection_rate': 50_000,
+                'withdrawal_rate': 50_000, 'max_storage': 2_000_000}
+    lines = [{'id': 'first', **contract},
+             {'id': 'scalar', **contract, 'injection_dates': 5},
+             {'id': 'nested', **contract, 'withdrawal_dates': [['2024-12-31']]},
+             [1, 2],
+             {'id': 'last', **contract}]
+    source = tmp_path / 'contracts.jsonl'
+    source.write_text('\n'.join(json.dumps(line) for line in lines) + '\n')
+    output = tmp_path / 'values.csv'
+
+    assert main(['--quiet', 'value', '-i', str(source), '-o', str(output)]) == 1
+    assert list(pd.read_csv(output)['id']) == ['first', 'last']
+
+def test_batch_size_must_be_positive(tmp_path):
+    #Test that a zero batch size is rejected instead of silently writing nothing.
+    source = tmp_path / 'dates.txt'
+    source.write_text("2022-06-30\n")
+    with pytest.raises(SystemExit) as exit_info:
+        main(['predict', '-i', str(source), '-b', '0'])
+    assert exit_info.value.code == 2
@@ -0,0 +1,100 @@
+import matplotlib
+matplotlib.use('Agg')
+
+import numpy as np
+import pytest
+from src.data.export import export_valuations
+from src.models.contract_pricer import StorageContractPricer
+from src.models.predictor import GasPricePredictor
+from src.visualization.plots import create_contract_dashboard, plot_contract_costs, plot_trade_prices
+
+BASE = dict(volume_per_trade=500_000, injection_rate=50_000, withdrawal_rate=50_000, max_storage=2_000_000)
+
+CONTRACTS = [
+    dict(id='a', hub='henry', injection_dates=['2024-06-30'], withdrawal_dates=['2024-12-31'], **BASE),
+    dict(id='b', hub='henry', injection_dates=['2024-06-30', '2024-07-31'],
+         withdrawal_dates=['2024-12-31', '2025-01-31'], **BASE),
+    dict(id='c', hub='nbp', injection_dates=['2024-05-31'], withdrawal_dates=['2024-11-30'],
+         storage_cost_monthly=50_000, **BASE),
+    dict(id='d', hub='nbp', injection_dates=['2024-06-30'], withdrawal_dates=['2024-12-31'],
+         volume_per_trade=3_000_000, injection_rate=50_000, withdrawal_rate=50_000, max_storage=2_000_000)
+]
+
+@pytest.fixture(scope='module')
+def pricer():
+    #Create a contract pricer shared by the book tests.
+    return StorageContractPricer(GasPricePredictor('data/raw/Nat_Gas.csv'))
+
+@pytest.fixture(scope='module')
+def book(pricer):
+    #Price a small book including one infeasible contract.
+    return pricer.price_book(CONTRACTS)
+
+def test_book_matches_single_valuations(pricer, book):
+    #Test that columnar results agree with per-contract valuations.
+    for i, contract in enumerate(CONTRACTS[:3]):
+        spec = {k: v for k, v in contract.items() if k not in ('id', 'hub')}
+        expected = pricer.calculate_contract_value(**spec)
+        actual = book.contract(i)
+        assert actual['contract_value'] == pytest.approx(expected['contract_value'])
+        assert actual['details']['storage_cost'] == expected['details']['storage_cost']
+        np.testing.assert_allclose(actual['details']['sale_prices'], expected['details']['sale_prices'])
+
+def test_infeasible_contract_flagged(book):
+    #Test that failing contracts are kept with an error instead of aborting the book.
+    assert book.contracts['error'][3].startswith("Total volume exceeds maximum storage capacity")
+    assert np.isnan(book.contracts['contract_value'][3])
+    assert list(book.valid) == [True, True, True, False]
+
+def test_aggregation(book):
+    #Test vectorized totals and group-bys over the book.
+    totals = book.totals()
+    assert totals['contract_value'] == pytest.approx(np.nansum(book.contracts['contract_value']))
+
+    by_hub = book.groupby('hub')
+    assert list(by_hub.index) == ['henry', 'nbp']
+    assert list(by_hub['contracts']) == [2, 1]
+    assert by_hub['contract_value'].sum() == pytest.approx(totals['contract_value'])
+
+    by_tenor = book.groupby('tenor')
+    assert list(by_tenor.index) == ['2024-05', '2024-06']
+
+def test_frames_and_export(book, tmp_path):
+    #Test DataFrame conversion and bulk export of a book.
+    assert len(book.to_frame()) == 4
+    assert len(book.to_frame('leg')) == 5
+    path = export_valuations(book, str(tmp_path / 'book.npy'))
+    assert list(np.load(path)['id']) == ['a', 'b', 'c', 'd']
+
+def test_plots_accept_book(book, tmp_path):
+    #Test that the contract plotting helpers accept a book.
+    plot_contract_costs(book, save_path=str(tmp_path / 'costs.png'))
+    plot_trade_prices(contract_details=book, by='hub', save_path=str(tmp_path / 'prices.png'))
+    create_contract_dashboard(contract_details=book, save_path=str(tmp_path / 'dashboard.png'))
+    assert (tmp_path / 'dashboard.png').exists()
+
+def test_unused_date_arguments_deprecated(book, tmp_path):
+    #Test that passing the old date arguments warns.
+    with pytest.warns(DeprecationWarning):
+        plot_trade_prices(['2024-06-30'], ['2024-12-31'], book.contract(0), save_path=str(tmp_path / 'p.png'))
+
+def test_leg_prices_aggregated(book):
+    #Test volume-weighted leg prices per group over valid contracts.
+    labels, purchases, sales = book.leg_prices('hub')
+    assert list(labels) == ['henry', 'nbp']
+    legs = book.legs
+    henry = legs['contract'] < 2
+    assert purchases[0] == pytest.approx(np.average(legs['purchase_price'][henry], weights=legs['volume'][henry]))
+    assert sales[1] == pytest.approx(legs['sale_price'][legs['contract'] == 2][0])
+
+def test_empty_and_invalid_books(pricer):
+    #Test that books without any valued legs still produce float columns.
+    empty = pricer.price_book([])
+    assert len(empty) == 0
+    assert empty.totals()['contract_value'] == 0.0
+
+    mismatched = dict(CONTRACTS[0], withdrawal_dates=[])
+    invalid = pricer.price_book([mismatched, mismatched])
+    assert not invalid.valid.any()
+    assert np.isnan(invalid.contracts['contract_value']).all()
+    assert len(invalid.groupby('hub')) == 0
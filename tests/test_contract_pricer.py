@@ -140,4 +140,17 @@ def test_contract_value_components(pricer):
     details = result['details']
     total_costs = (details['storage_cost'] + details['injection_cost'] + details['withdrawal_cost'] + details['transport_cost'])
     
-    assert abs(result['contract_value'] - (details['gross_profit'] - total_costs)) < 0.01
\ No newline at end of file
+    assert abs(result['contract_value'] - (details['gross_profit'] - total_costs)) < 0.01
+
+def test_staggered_trades_within_capacity(pricer):
+    #Test that trades cycling through storage are valued even if their total volume exceeds capacity.
+    result = pricer.calculate_contract_value(
+        injection_dates=['2024-06-30', '2024-08-31'],
+        withdrawal_dates=['2024-07-31', '2024-12-31'],
+        volume_per_trade=1_500_000,
+        injection_rate=100_000,
+        withdrawal_rate=100_000,
+        max_storage=2_000_000
+    )
+    assert result['feasibility']['peak_inventory'] == 1_500_000
+    assert len(result['details']['purchase_prices']) == 2
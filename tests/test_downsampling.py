@@ -0,0 +1,45 @@
+import matplotlib
+matplotlib.use('Agg')
+
+import numpy as np
+import pandas as pd
+from src.visualization.downsampling import downsample, lttb_indices, min_max_indices
+from src.visualization.plots import create_analysis_dashboard, plot_price_history
+
+def _daily_series(n=50_000):
+    #Create a long noisy daily series with a single spike.
+    rng = np.random.default_rng(0)
+    values = 10 + np.cumsum(rng.normal(0, 0.1, n))
+    values[n // 3] += 25
+    return pd.Series(values, index=pd.date_range('1950-01-01', periods=n, freq='D'))
+
+def test_lttb_keeps_endpoints_and_spike():
+    #Test that LTTB keeps both endpoints and visually important extremes.
+    series = _daily_series()
+    indices = lttb_indices(np.arange(len(series), dtype=float), series.to_numpy(), 500)
+    assert len(indices) == 500
+    assert indices[0] == 0 and indices[-1] == len(series) - 1
+    assert np.all(np.diff(indices) > 0)
+    assert len(series) // 3 in indices
+
+def test_min_max_preserves_range():
+    #Test that min/max bucketing preserves the global extremes.
+    series = _daily_series()
+    shown = series.iloc[min_max_indices(series.to_numpy(), 200)]
+    assert len(shown) <= 402
+    assert shown.max() == series.max()
+    assert shown.min() == series.min()
+
+def test_short_series_untouched():
+    #Test that series shorter than the target are returned as-is.
+    series = _daily_series(100)
+    assert downsample(series, 500) is series
+
+def test_plots_render_long_series(tmp_path):
+    #Test that the plotting layer renders long series with downsampling enabled.
+    series = _daily_series()
+    df = series.to_frame('Prices')
+    plot_price_history(df, save_path=str(tmp_path / 'history.png'))
+    create_analysis_dashboard(df, series, series.shift(1).bfill(), save_path=str(tmp_path / 'dashboard.png'))
+    assert (tmp_path / 'history.png').exists()
+    assert (tmp_path / 'dashboard.png').exists()
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.data.export import (export_forward_curve, export_valuations, to_arrow,
+                             trade_columns, valuation_columns, write_columns)
+from src.models.contract_pricer import StorageContractPricer
+from src.models.predictor import GasPricePredictor
+
+@pytest.fixture(scope='module')
+def predictor():
+    #Create a predictor shared by the export tests.
+    return GasPricePredictor('data/raw/Nat_Gas.csv')
+
+@pytest.fixture(scope='module')
+def results(predictor):
+    #Value a small book of contracts.
+    pricer = StorageContractPricer(predictor)
+    base = dict(volume_per_trade=500_000, injection_rate=50_000, withdrawal_rate=50_000, max_storage=2_000_000)
+    return pricer.calculate_contract_values([
+        dict(injection_dates=['2024-06-30'], withdrawal_dates=['2024-12-31'], **base),
+        dict(injection_dates=['2024-06-30', '2024-07-31'], withdrawal_dates=['2024-12-31', '2025-01-31'], **base)
+    ])
+
+def test_forward_curve_starts_after_last_observation(predictor):
+    #Test that the curve is forecast from the end of the data and brackets the mean.
+    curve = predictor.forward_curve(steps=6)
+    dates = pd.DatetimeIndex(curve['date'])
+    assert dates[0] == predictor.df.index[-1] + pd.offsets.MonthEnd(1)
+    np.testing.assert_allclose(curve['mean'], predictor.predict_batch(dates.strftime('%Y-%m-%d')))
+    assert curve['mean'][0] == pytest.approx(predictor.predict(dates[0].strftime('%Y-%m-%d')))
+    assert np.all(curve['lower'] < curve['mean']) and np.all(curve['mean'] < curve['upper'])
+
+    # Forecasting from the end of training would give wider intervals for the same date
+    horizon = len(pd.date_range(predictor.train_end, dates[0], freq='ME')) - 1
+    from_train = np.asarray(predictor.model.get_forecast(steps=horizon).conf_int(), dtype=float)[-1]
+    assert curve['upper'][0] - curve['lower'][0] < from_train[1] - from_train[0]
+
+def test_arrow_is_zero_copy(predictor):
+    #Test that Arrow columns wrap the NumPy buffers instead of copying them.
+    pytest.importorskip('pyarrow')
+    curve = predictor.forward_curve(steps=6)
+    table = to_arrow(curve)
+    assert table.column('mean').chunk(0).buffers()[1].address == curve['mean'].ctypes.data
+
+def test_valuation_tables(results):
+    #Test the per-contract and per-trade valuation columns.
+    contracts = valuation_columns(results, ids=['a', 'b'])
+    np.testing.assert_allclose(contracts['contract_value'], [r['contract_value'] for r in results])
+    assert list(contracts['n_trades']) == [1, 2]
+
+    trades = trade_columns(results)
+    assert list(trades['contract']) == [0, 1, 1]
+    assert list(trades['trade']) == [0, 0, 1]
+    assert trades['sale_price'][2] == results[1]['details']['sale_prices'][1]
+
+@pytest.mark.parametrize('suffix', ['.feather', '.parquet', '.npy'])
+def test_bulk_write_roundtrip(predictor, results, tmp_path, suffix):
+    #Test that curves and valuations round-trip through every export format.
+    if suffix != '.npy':
+        pytest.importorskip('pyarrow')
+    curve_path = export_forward_curve(predictor, str(tmp_path / f'curve{suffix}'), steps=6)
+    values_path = export_valuations(results, str(tmp_path / f'values{suffix}'), ids=['a', 'b'])
+
+    if suffix == '.npy':
+        curve = np.load(curve_path)
+        values = np.load(values_path)
+    else:
+        reader = pd.read_feather if suffix == '.feather' else pd.read_parquet
+        curve = reader(curve_path)
+        values = reader(values_path)
+    assert len(curve['mean']) == 6
+    assert list(values['id']) == ['a', 'b']
+
+def test_unknown_format_rejected(tmp_path):
+    #Test that unsupported suffixes are rejected.
+    with pytest.raises(ValueError, match="Cannot infer export format"):
+        write_columns({'x': np.arange(3)}, str(tmp_path / 'out.xlsx'))
+
+def test_structured_strings_not_truncated(tmp_path):
+    #Test that long string values survive a .npy export and None is rejected.
+    ids = np.array(['x' * 100, 'short'], dtype=object)
+    path = write_columns({'id': ids, 'value': np.arange(2.0)}, str(tmp_path / 'ids.npy'))
+    assert list(np.load(path)['id']) == list(ids)
+
+    with pytest.raises(ValueError, match="contains None"):
+        write_columns({'id': np.array([None, 'a'], dtype=object)}, str(tmp_path / 'none.npy'))
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+from src.models.feasibility import check_inventory
+
+def test_staggered_contract_is_feasible():
+    #Test that trades cycling through storage one after another fit within capacity.
+    report = check_inventory(
+        injection_dates=['2024-04-01', '2024-06-01', '2024-08-01'],
+        withdrawal_dates=['2024-05-01', '2024-07-01', '2024-09-01'],
+        volume_per_trade=1_000_000, injection_rate=100_000, withdrawal_rate=100_000,
+        max_storage=1_500_000)
+    assert report['feasible']
+    assert report['peak_inventory'] == 1_000_000
+    assert report['peak_date'] == '2024-04-11'
+
+def test_capacity_violation_date():
+    #Test that the first date inventory passes capacity is reported.
+    report = check_inventory(['2024-06-01', '2024-06-11'], ['2024-12-01', '2024-12-01'],
+                             volume_per_trade=1_000_000, injection_rate=100_000,
+                             withdrawal_rate=500_000, max_storage=1_500_000)
+    assert report['violation'] == 'capacity'
+    assert report['first_violation_date'] == '2024-06-16'
+
+def test_overlapping_injections_exceed_rate():
+    #Test that injections running at the same time exceed the daily injection rate.
+    report = check_inventory(['2024-06-01', '2024-06-05'], ['2024-12-01', '2024-12-31'],
+                             volume_per_trade=1_000_000, injection_rate=100_000,
+                             withdrawal_rate=100_000, max_storage=5_000_000)
+    assert report['violation'] == 'injection_rate'
+    assert report['first_violation_date'] == '2024-06-05'
+
+def test_withdrawal_before_injection():
+    #Test that withdrawing gas that has not been injected yet is rejected.
+    report = check_inventory(['2024-12-01'], ['2024-06-01'], volume_per_trade=1_000_000,
+                             injection_rate=100_000, withdrawal_rate=100_000, max_storage=2_000_000)
+    assert report['violation'] == 'negative_inventory'
+    assert report['first_violation_date'] == '2024-06-01'
+
+def test_thousands_of_legs():
+    #Test that large contracts are swept correctly, including a late violation.
+    starts = pd.date_range('2000-01-01', periods=5_000, freq='7D')
+    injections = starts.strftime('%Y-%m-%d')
+    withdrawals = (starts + pd.Timedelta(days=3)).strftime('%Y-%m-%d')
+    report = check_inventory(injections, withdrawals, volume_per_trade=100_000, injection_rate=50_000,
+                             withdrawal_rate=50_000, max_storage=150_000)
+    assert report['feasible']
+    assert np.isclose(report['peak_inventory'], 100_000)
+    assert report['peak_date'] == '2000-01-03'
+
+    # Holding the second-to-last trade until the final injection has run two days
+    # pushes inventory past capacity one day into that injection
+    late = withdrawals.tolist()
+    late[-2] = (starts[-1] + pd.Timedelta(days=2)).strftime('%Y-%m-%d')
+    report = check_inventory(injections, late, volume_per_trade=100_000, injection_rate=50_000,
+                             withdrawal_rate=50_000, max_storage=150_000)
+    assert report['violation'] == 'capacity'
+    assert report['first_violation_date'] == (starts[-1] + pd.Timedelta(days=1)).strftime('%Y-%m-%d')
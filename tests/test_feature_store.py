@@ -0,0 +1,59 @@
+import pickle
+import numpy as np
+import pandas as pd
+import pytest
+from src.data.feature_store import FeatureStore
+from src.models.predictor import GasPricePredictor
+
+@pytest.fixture
+def store():
+    #Create a store with a seasonal heating-degree-day style regressor.
+    dates = pd.date_range('2020-01-31', '2024-09-30', freq='ME')
+    hdd = pd.DataFrame({'HDD': 300 * (1 + np.cos(2 * np.pi * (dates.month - 1) / 12))}, index=dates)
+    return FeatureStore(hdd)
+
+def test_align_is_cached(store):
+    #Test that aligned matrices are contiguous, read-only and cached.
+    index = pd.date_range('2021-01-31', periods=12, freq='ME')
+    first = store.align(index)
+    second = store.align(index)
+    assert first is second
+    assert first.shape == (12, 1)
+    assert first.flags['C_CONTIGUOUS'] and not first.flags['WRITEABLE']
+    assert store.cache_info() == {'hits': 1, 'misses': 1, 'evictions': 0, 'size': 1}
+
+def test_future_dates_use_climatology(store):
+    #Test that dates beyond the sources are filled with the calendar-month mean.
+    values = store.align(pd.DatetimeIndex(['2025-01-31', '2025-07-31']))
+    np.testing.assert_allclose(values[:, 0], [600.0, 300 * (1 + np.cos(np.pi))], atol=1e-9)
+
+def test_missing_dates_rejected_without_fill(store):
+    #Test that alignment fails loudly when no fill method is configured.
+    strict = FeatureStore(pd.DataFrame({'HDD': [1.0]}, index=pd.DatetimeIndex(['2020-01-31'])), fill=None)
+    with pytest.raises(ValueError, match="No regressor values available"):
+        strict.align(pd.DatetimeIndex(['2020-02-29']))
+
+def test_predictor_with_exog(store):
+    #Test that the predictor fits and forecasts with exogenous regressors.
+    predictor = GasPricePredictor('data/raw/Nat_Gas.csv', exog=store)
+    assert predictor.model.model.k_exog == 1
+    assert isinstance(predictor.predict('2024-12-31'), float)
+    assert isinstance(predictor.predict('2024-06-30'), float)
+    assert isinstance(predictor.predict('2022-06-30'), float)
+
+def test_align_cache_is_bounded():
+    #Test that the alignment cache evicts the least recently used windows.
+    dates = pd.date_range('2020-01-31', '2024-09-30', freq='ME')
+    store = FeatureStore(pd.DataFrame({'HDD': np.arange(len(dates), dtype=float)}, index=dates),
+                         max_cache_entries=2)
+    for periods in (1, 2, 3, 4):
+        store.align(dates[:periods])
+    info = store.cache_info()
+    assert info['size'] == 2
+    assert info['evictions'] == 2
+
+def test_store_pickles(store):
+    #Test that a store survives a pickle round trip, e.g. into a process pool.
+    index = pd.date_range('2021-01-31', periods=12, freq='ME')
+    copy = pickle.loads(pickle.dumps(store))
+    np.testing.assert_array_equal(copy.align(index), store.align(index))
@@ -0,0 +1,45 @@
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+import pytest
+from src.models.predictor import GasPricePredictor
+from src.models.serving import HotSwapPredictor
+
+def test_fast_profile_reports_diagnostics():
+    #Test that the fast profile converges and reports fit diagnostics in the metrics.
+    predictor = GasPricePredictor('data/raw/Nat_Gas.csv', fit_profile='fast')
+    metrics = predictor.get_metrics()
+    assert metrics['fit_profile'] == 'fast'
+    assert metrics['converged']
+    assert metrics['fit_time'] > 0
+    assert metrics['r2'] > 0.80
+
+def test_budget_keeps_latest_iterate():
+    #Test that an exhausted budget still yields a usable model.
+    predictor = GasPricePredictor('data/raw/Nat_Gas.csv', fit_budget=1e-6)
+    metrics = predictor.get_metrics()
+    assert metrics['budget_exhausted']
+    assert not metrics['converged']
+    assert isinstance(predictor.predict('2024-12-31'), float)
+
+def test_accurate_profile_races_optimizers():
+    #Test that the accurate profile races several optimizers and keeps a converged one.
+    predictor = GasPricePredictor('data/raw/Nat_Gas.csv', fit_profile='accurate')
+    metrics = predictor.get_metrics()
+    assert metrics['optimizers_tried'] == 3
+    assert metrics['converged']
+
+def test_unknown_profile_rejected():
+    #Test that unknown fit profiles are rejected.
+    with pytest.raises(ValueError, match="Unknown fit profile"):
+        GasPricePredictor('data/raw/Nat_Gas.csv', fit_profile='instant')
+
+def test_predictor_pickles_for_process_pool():
+    #Test that fitted predictors can be shipped to and from a process pool.
+    predictor = GasPricePredictor('data/raw/Nat_Gas.csv', fit_profile='fast')
+    copy = pickle.loads(pickle.dumps(predictor))
+    assert copy.predict('2024-12-31') == predictor.predict('2024-12-31')
+
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        with HotSwapPredictor('data/raw/Nat_Gas.csv', executor=executor, fit_profile='fast') as serving:
+            assert serving.refit().result(timeout=120) is True
+            assert serving.version == 2
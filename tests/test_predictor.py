@@ -33,4 +33,10 @@ def test_future_prediction(predictor):
     prediction = predictor.predict('2024-12-31')
     assert isinstance(prediction, float)
     # Future predictions should still be within reasonable bounds
-    assert 9.5 < prediction < 13.5  # Based on historical ranges
\ No newline at end of file
+    assert 9.5 < prediction < 13.5  # Based on historical ranges
+
+def test_batch_prediction_matches_predict(predictor):
+    #Test that batch prediction handles past, off-index and future dates like predict.
+    dates = ['2022-06-30', '2024-06-15', '2025-03-31']
+    expected = [predictor.predict(d) for d in dates]
+    assert list(predictor.predict_batch(dates)) == pytest.approx(expected)
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.data.data_loader import load_gas_prices
+from src.data.resampling import resample_prices, preprocess_price_file
+
+@pytest.fixture
+def raw_file(tmp_path):
+    #Write an unsorted file of daily prints with a missing month and one spike.
+    dates = pd.date_range('2020-01-01', '2021-12-31', freq='D')
+    dates = dates[~((dates.year == 2020) & (dates.month == 6))]
+    prices = 10 + np.sin(np.arange(len(dates)) / 58.0)
+    prices[dates.get_loc(pd.Timestamp('2021-03-31'))] = 50.0
+    df = pd.DataFrame({'Dates': dates.strftime('%Y-%m-%d'), 'Prices': prices})
+    path = tmp_path / 'raw.csv'
+    df.sample(frac=1, random_state=0).to_csv(path, index=False)
+    return path, df
+
+def test_chunked_matches_in_memory(raw_file):
+    #Test that chunked month-end resampling matches a full in-memory resample.
+    path, df = raw_file
+    result = resample_prices(str(path), chunksize=37, fill_method=None)
+
+    expected = df.assign(Dates=pd.to_datetime(df['Dates'])).set_index('Dates')['Prices'].resample('ME').last()
+    assert result.index.equals(expected.index)
+    np.testing.assert_allclose(result['Prices'], expected, equal_nan=True)
+    assert result['Count'].sum() == len(df)
+
+def test_gaps_and_outliers_flagged(raw_file):
+    #Test that missing buckets are filled and flagged and spikes are marked as outliers.
+    path, _ = raw_file
+    result = resample_prices(str(path), chunksize=100)
+
+    assert result.loc['2020-06-30', 'Filled']
+    assert not np.isnan(result.loc['2020-06-30', 'Prices'])
+    assert result.loc['2021-03-31', 'Outlier']
+    assert result['Outlier'].sum() == 1
+
+def test_processed_parquet_roundtrip(raw_file, tmp_path):
+    #Test that the processed columnar file loads back through load_gas_prices.
+    pytest.importorskip('pyarrow')
+    path, _ = raw_file
+    output = preprocess_price_file(str(path), output_path=str(tmp_path / 'out.parquet'), freq='D')
+
+    df = load_gas_prices(output)
+    assert df.index.name == 'Dates'
+    assert 'Prices' in df.columns
+    assert len(df) == len(pd.date_range('2020-01-01', '2021-12-31', freq='D'))
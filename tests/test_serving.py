@@ -0,0 +1,89 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+import pytest
+from src.models.serving import HotSwapPredictor
+
+@pytest.fixture
+def serving():
+    #Create a hot-swappable predictor for testing.
+    with HotSwapPredictor('data/raw/Nat_Gas.csv') as predictor:
+        yield predictor
+
+def test_predict_from_snapshot(serving):
+    #Test that predictions are served from the current snapshot.
+    assert serving.version == 1
+    assert serving.predict('2024-12-31') == serving.snapshot.predict('2024-12-31')
+
+def test_refit_swaps_snapshot(serving):
+    #Test that a passing refit swaps in a new snapshot.
+    old = serving.snapshot
+    assert serving.refit().result(timeout=60) is True
+    assert serving.version == 2
+    assert serving.snapshot is not old
+
+def test_rejected_refit_keeps_snapshot(serving):
+    #Test that a refit failing the metric thresholds is not swapped in.
+    old = serving.snapshot
+    serving.metric_thresholds = {'rmse': 0.0}
+    assert serving.refit().result(timeout=60) is False
+    assert serving.version == 1
+    assert serving.snapshot is old
+
+def test_predict_during_refit(serving):
+    #Test that predictions keep being served while a refit runs.
+    expected = serving.predict('2022-06-30')
+    errors = []
+
+    def worker():
+        try:
+            for _ in range(20):
+                assert abs(serving.predict('2022-06-30') - expected) < 1e-6
+        except Exception as e:
+            errors.append(e)
+
+    future = serving.refit()
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    future.result(timeout=60)
+    assert not errors
+
+def test_future_predictions_thread_safe(serving):
+    #Test that concurrent forecasts for future dates match the serial results.
+    dates = pd.date_range('2024-10-31', '2026-12-31', freq='ME').strftime('%Y-%m-%d').tolist()
+    expected = {d: serving.predict(d) for d in dates}
+    mismatches = []
+
+    def worker():
+        for d in dates:
+            if abs(serving.predict(d) - expected[d]) > 1e-9:
+                mismatches.append(d)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not mismatches
+
+def test_refit_gated_on_live_metrics(serving):
+    #Test that a refit much worse than the live snapshot is rejected.
+    serving.snapshot.metrics['rmse'] = serving.snapshot.metrics['rmse'] / 2
+    assert serving.refit().result(timeout=60) is False
+    assert serving.version == 1
+
+def test_refit_with_closed_executor():
+    #Test that a refit that cannot be submitted resolves with the error.
+    executor = ThreadPoolExecutor(max_workers=1)
+    serving = HotSwapPredictor('data/raw/Nat_Gas.csv', executor=executor)
+    executor.shutdown()
+    first = serving.refit()
+    assert isinstance(first.exception(timeout=1), RuntimeError)
+    assert serving.refit() is not first
@@ -0,0 +1,81 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from src.models.contract_pricer import StorageContractPricer
+from src.models.predictor import GasPricePredictor
+from src.models.valuation_cache import ValuationCache
+
+@pytest.fixture(scope='module')
+def predictor():
+    #Create a predictor shared by the cache tests.
+    return GasPricePredictor('data/raw/Nat_Gas.csv')
+
+def test_lru_eviction():
+    #Test that the least recently used entry is evicted first.
+    cache = ValuationCache(max_entries=2)
+    cache.put('a', {'contract_value': 1})
+    cache.put('b', {'contract_value': 2})
+    cache.get('a')
+    cache.put('c', {'contract_value': 3})
+    assert cache.get('b') is None
+    assert cache.get('a') is not None
+    stats = cache.stats()
+    assert stats['evictions'] == 1
+    assert stats['hits'] == 2
+    assert stats['misses'] == 1
+
+def test_disk_tier_persists(tmp_path):
+    #Test that entries survive a new cache instance pointing at the same directory.
+    ValuationCache(cache_dir=str(tmp_path)).put('k', {'contract_value': 42})
+    cache = ValuationCache(cache_dir=str(tmp_path))
+    assert cache.get('k') == {'contract_value': 42}
+    assert cache.stats()['disk_hits'] == 1
+
+def test_pricer_cache_hit(predictor):
+    #Test that repeated and reordered contracts are served from the cache.
+    cache = ValuationCache()
+    pricer = StorageContractPricer(predictor, cache=cache)
+    params = dict(volume_per_trade=500_000, injection_rate=50_000,
+                  withdrawal_rate=50_000, max_storage=2_000_000)
+
+    first = pricer.calculate_contract_value(['2024-06-30', '2024-07-31'],
+                                            ['2024-12-31', '2025-01-31'], **params)
+    swapped = pricer.calculate_contract_value(['2024-07-31', '2024-06-30'],
+                                              ['2025-01-31', '2024-12-31'], **params)
+
+    assert cache.stats()['hits'] == 1
+    assert swapped['contract_value'] == first['contract_value']
+    assert swapped['details']['purchase_prices'] == first['details']['purchase_prices'][::-1]
+    assert swapped['details']['sale_prices'] == first['details']['sale_prices'][::-1]
+
+def test_cached_result_is_isolated(predictor):
+    #Test that mutating a returned result does not corrupt the cache.
+    pricer = StorageContractPricer(predictor, cache=ValuationCache())
+    args = (['2024-06-30'], ['2024-12-31'], 1_000_000, 50_000, 50_000, 2_000_000)
+
+    result = pricer.calculate_contract_value(*args)
+    expected = result['details']['purchase_prices'][0]
+    result['details']['purchase_prices'][0] = -1.0
+    assert pricer.calculate_contract_value(*args)['details']['purchase_prices'][0] == expected
+
+def test_disk_tier_is_bounded(tmp_path):
+    #Test that the least recently used disk entries are pruned past the limit.
+    cache = ValuationCache(max_entries=1, cache_dir=str(tmp_path), max_disk_entries=10)
+    for i in range(10):
+        cache.put(f'k{i}', {'contract_value': i})
+        os.utime(tmp_path / f'k{i}.pkl', (i, i))
+    cache.put('k10', {'contract_value': 10})
+    assert len(list(tmp_path.glob('*.pkl'))) == 9
+    assert cache.stats()['disk_evictions'] == 2
+    assert not (tmp_path / 'k0.pkl').exists()
+    assert (tmp_path / 'k10.pkl').exists()
+
+def test_int_and_float_costs_share_entry(predictor):
+    #Test that numerically equal cost arguments hit the same cache entry.
+    cache = ValuationCache()
+    pricer = StorageContractPricer(predictor, cache=cache)
+    pricer.calculate_contract_value(['2024-06-30'], ['2024-12-31'], 1_000_000, 50_000, 50_000, 2_000_000)
+    pricer.calculate_contract_value(['2024-06-30'], ['2024-12-31'], 1e6, 5e4, 5e4, 2e6)
+    assert cache.stats()['hits'] == 1
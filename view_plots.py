@@ -69,10 +69,10 @@ def view_contract_analysis():
     plot_contract_costs(result)
     
     print("\n2. Showing trade prices comparison...")
-    plot_trade_prices(injection_dates, withdrawal_dates, result)
+    plot_trade_prices(contract_details=result)
     
     print("\n3. Showing complete contract analysis dashboard...")
-    create_contract_dashboard(injection_dates, withdrawal_dates, result)
+    create_contract_dashboard(contract_details=result)
 
 def main():
     """Main function to view all visualizations."""